@@ -0,0 +1,124 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from .configuration import Configuration
+from .node import AgentNodes
+from .pdfs import pdf_store
+from .scheduler import BATCH, call_priority
+from ..metrics import finish_trace, node_scope, start_trace
+
+DEFAULT_BATCH_PROMPT = "Summarize this page and create a PDF"
+
+
+@dataclass
+class BatchItem:
+    url: str
+    prompt: Optional[str] = None
+
+
+@dataclass
+class BatchLimits:
+    fetch: int = 4
+    llm: int = 1
+    render: int = 2
+
+
+class BatchRunner:
+    """Runs many URLs through scrape -> web model -> content model -> PDF.
+
+    Perception is skipped. Each item moves through the stages on its own
+    worker thread, and every stage is gated by its own semaphore, so
+    items overlap: one can be rendering while another waits on the LLM and
+    a third is still being fetched. Both model calls share the ``llm``
+    limit because Ollama is the scarce resource.
+    """
+
+    def __init__(self, nodes: AgentNodes, limits: BatchLimits, max_workers: int = 16):
+        self.nodes = nodes
+        self.limits = limits
+        self.max_workers = max_workers
+        self._fetch = threading.Semaphore(limits.fetch)
+        self._llm = threading.Semaphore(limits.llm)
+        self._render = threading.Semaphore(limits.render)
+
+    def run(self, items: list[BatchItem], profile: Optional[str] = None) -> Iterator[dict]:
+        """Yield per-item status events as they happen, then a summary event."""
+        cfg = self.nodes.settings({"configurable": {"profile": profile}})
+        events: queue.Queue = queue.Queue()
+        workers = max(1, min(self.max_workers, len(items)))
+        results = []
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as executor:
+            for index, item in enumerate(items):
+                executor.submit(self._run_item, index, item, cfg, events)
+
+            while len(results) < len(items):
+                event = events.get()
+                if event["status"] in ("completed", "failed"):
+                    results.append(event)
+                yield event
+
+        yield {
+            "status": "done",
+            "total": len(items),
+            "completed": sum(1 for r in results if r["status"] == "completed"),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+        }
+
+    def _run_item(self, index: int, item: BatchItem, cfg: Configuration, events: queue.Queue):
+        with call_priority(BATCH):
+            self._run_stages(index, item, cfg, events)
+
+    def _run_stages(self, index: int, item: BatchItem, cfg: Configuration, events: queue.Queue):
+        request_id = str(uuid4())
+        prompt = item.prompt or DEFAULT_BATCH_PROMPT
+        base = {"index": index, "request_id": request_id, "url": item.url}
+        nodes = self.nodes
+
+        start_trace(request_id)
+        stage = "fetch"
+        try:
+            keyword = nodes._extract_keywords('', prompt)
+
+            with self._fetch, node_scope("web", request_id):
+                scraped_data = nodes._scrape(item.url, keyword)
+            if not scraped_data.get('full_content'):
+                raise RuntimeError(f"Failed to scrape content from {item.url}")
+            events.put({**base, "status": "fetched"})
+
+            stage = "llm"
+            with self._llm, node_scope("web", request_id):
+                processed = nodes._process_web(prompt, scraped_data, cfg)
+            with self._llm, node_scope("content", request_id):
+                final_content = nodes._format_content(prompt, processed, cfg)
+            events.put({**base, "status": "processed"})
+
+            stage = "render"
+            with self._render, node_scope("content", request_id):
+                pdf_result = nodes._render_pdf(
+                    str(scraped_data.get('title') or 'Untitled Document'),
+                    final_content,
+                    item.url,
+                    keyword,
+                    request_id
+                )
+            if not pdf_result.get('success'):
+                raise RuntimeError(f"PDF generation failed: {pdf_result.get('error', 'Unknown error')}")
+
+            pdf_store.put_file(request_id, pdf_result['filename'], pdf_result['file_path'])
+
+            trace = finish_trace(request_id)
+            events.put({
+                **base,
+                "status": "completed",
+                "pdf_file_path": pdf_result.get('file_path'),
+                "pdf_url": f"/runs/{request_id}/pdf",
+                "timings": trace.breakdown() if trace else {},
+            })
+        except Exception as e:
+            finish_trace(request_id)
+            events.put({**base, "status": "failed", "stage": stage, "error": str(e)})
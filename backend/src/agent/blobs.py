@@ -0,0 +1,50 @@
+import threading
+from typing import Optional
+
+BLOB_SCHEME = "blob://"
+
+
+class BlobStore:
+    """Large per-request values (screenshots, page text) kept out of the graph state.
+
+    Nodes put a value here and store only the returned handle in
+    ``OverallState``, so LangGraph's state merging and any checkpointer copy
+    a short string instead of megabytes. Everything a request stored is
+    dropped by :meth:`release` when the request finishes, or, for a run that
+    can be resumed, when its checkpoint is dropped.
+    """
+
+    def __init__(self):
+        self._blobs: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, request_id: Optional[str], name: str, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        request_id = request_id or "local"
+        with self._lock:
+            self._blobs.setdefault(request_id, {})[name] = value
+        return f"{BLOB_SCHEME}{request_id}/{name}"
+
+    def get(self, handle: Optional[str]) -> Optional[str]:
+        if not handle or not handle.startswith(BLOB_SCHEME):
+            return handle
+        request_id, _, name = handle[len(BLOB_SCHEME):].partition("/")
+        with self._lock:
+            return self._blobs.get(request_id, {}).get(name)
+
+    def release(self, request_id: Optional[str]) -> int:
+        """Drop a request's blobs; returns how many characters were freed."""
+        with self._lock:
+            blobs = self._blobs.pop(request_id or "local", {})
+        return sum(len(v) for v in blobs.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": len(self._blobs),
+                "chars": sum(len(v) for blobs in self._blobs.values() for v in blobs.values()),
+            }
+
+
+blob_store = BlobStore()
@@ -0,0 +1,103 @@
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+# LLaVA 1.5/1.6 encode one image as a 24x24 grid of patch tokens.
+IMAGE_TOKENS = 576
+
+
+class TokenCounter:
+    """Estimates prompt tokens per model without a tokenizer.
+
+    Starts from a conservative characters-per-token ratio and calibrates it
+    per model from the prompt token counts Ollama reports after each call.
+    """
+
+    def __init__(self, chars_per_token: float = 3.5, smoothing: float = 0.2):
+        self.default_ratio = chars_per_token
+        self.smoothing = smoothing
+        self._ratios: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def ratio(self, model: str) -> float:
+        with self._lock:
+            return self._ratios.get(model, self.default_ratio)
+
+    def count(self, text: str, model: str) -> int:
+        return math.ceil(len(text) / self.ratio(model)) if text else 0
+
+    def observe(self, model: str, chars: int, tokens: Optional[int]):
+        if not tokens or chars < 200:
+            return
+        measured = min(max(chars / tokens, 2.0), 6.0)
+        with self._lock:
+            current = self._ratios.get(model, self.default_ratio)
+            self._ratios[model] = current + self.smoothing * (measured - current)
+
+
+@dataclass
+class Budget:
+    num_ctx: int
+    num_predict: int
+    margin: int = 64
+
+    @property
+    def input_tokens(self) -> int:
+        return self.num_ctx - self.num_predict - self.margin
+
+
+def compress(text: str) -> str:
+    """Cheap lossless-ish shrink: collapse whitespace and drop repeated lines (menus, footers)."""
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = re.sub(r"[ \t]+", " ", line).strip()
+        if line and line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def trim_to_tokens(text: str, max_tokens: int, counter: TokenCounter, model: str) -> str:
+    if max_tokens <= 0:
+        return ""
+    if counter.count(text, model) <= max_tokens:
+        return text
+
+    cut = text[: int(max_tokens * counter.ratio(model))]
+    for boundary in ("\n\n", "\n", ". "):
+        end = cut.rfind(boundary)
+        if end > len(cut) * 0.6:
+            return cut[: end + len(boundary)].rstrip()
+    return cut
+
+
+def fit_prompt(
+    counter: TokenCounter,
+    model: str,
+    budget: Budget,
+    fixed_parts: dict[str, str],
+    variable: str,
+) -> tuple[str, dict]:
+    """Trim ``variable`` so it fits in ``budget`` next to ``fixed_parts``.
+
+    Returns the text to use and a per-part token breakdown for logging.
+    """
+    breakdown = {name: counter.count(part, model) for name, part in fixed_parts.items()}
+    available = budget.input_tokens - sum(breakdown.values())
+
+    original_tokens = counter.count(variable, model)
+    fitted = variable
+    if original_tokens > available:
+        fitted = trim_to_tokens(compress(variable), available, counter, model)
+
+    breakdown["input"] = counter.count(fitted, model)
+    breakdown["input_dropped"] = max(0, original_tokens - breakdown["input"])
+    breakdown["available"] = available
+    return fitted, breakdown
+
+
+token_counter = TokenCounter()
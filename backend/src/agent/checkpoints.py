@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+
+class ResumableRuns:
+    """Checkpoint bookkeeping for /run, keyed by request_id (the graph thread_id).
+
+    Completed runs have their checkpoints dropped straight away; runs that
+    stopped on an error keep theirs so ``/run/{request_id}/resume`` can pick
+    up at the failed node. Only the newest ``max_failed`` are kept.
+    ``on_drop`` is called with the request id whenever a checkpoint is dropped,
+    to free what the checkpointed state still refers to.
+    """
+
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver,
+        max_failed: int = 50,
+        on_drop: Optional[Callable[[str], object]] = None,
+    ):
+        self.checkpointer = checkpointer
+        self.max_failed = max_failed
+        self.on_drop = on_drop
+        self._failed: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def config(request_id: str, profile: str | None = None) -> dict:
+        return {"configurable": {"thread_id": request_id, "profile": profile}}
+
+    def is_resumable(self, request_id: str) -> bool:
+        with self._lock:
+            return request_id in self._failed
+
+    def finished(self, request_id: str, resumable: bool):
+        evicted = []
+        with self._lock:
+            self._failed.pop(request_id, None)
+            if resumable:
+                self._failed[request_id] = None
+                while len(self._failed) > self.max_failed:
+                    evicted.append(self._failed.popitem(last=False)[0])
+            else:
+                evicted.append(request_id)
+
+        for thread_id in evicted:
+            self.checkpointer.delete_thread(thread_id)
+            if self.on_drop:
+                self.on_drop(thread_id)
@@ -4,6 +4,8 @@ from pydantic import BaseModel, Field
 
 from langchain_core.runnables import RunnableConfig
 
+from .profiles import PROFILES
+
 class Configuration(BaseModel):
     planning_model: str = Field(
         default="llama3.2:latest",
@@ -25,16 +27,146 @@ class Configuration(BaseModel):
         description="Process and transform content - text-only model for better quality"
     )
 
+    profile: str = Field(
+        default="balanced",
+        description="Named settings from profiles.PROFILES; per request via configurable, PROFILE env sets the default"
+    )
+
+    run_planning: bool = Field(
+        default=True,
+        description="Ask the planning model for a plan before perception"
+    )
+
+    perception_strategy: str = Field(
+        default="full",
+        description="'full': describe the screen, then ask for the URL if none was found; 'direct': only ask for the URL"
+    )
+
+    pipeline: str = Field(
+        default="two_stage",
+        description="'two_stage': the web model extracts and the content model formats; 'fused': one content model call writes the document from the page text"
+    )
+
+    num_ctx: int = Field(
+        default=4096,
+        description="Context window sent to Ollama; prompts are trimmed to fit it alongside num_predict"
+    )
+
+    num_predict: int = Field(
+        default=1024,
+        description="Maximum tokens Ollama generates per call, reserved out of num_ctx"
+    )
+
+    web_context_chars: int = Field(
+        default=3000,
+        description="Characters of scraped page text given to the web model"
+    )
+
+    content_context_chars: int = Field(
+        default=4000,
+        description="Characters of web model output given to the content model"
+    )
+
+    summary_words: Optional[int] = Field(
+        default=None,
+        description="Word limit the content model is asked to keep the document under"
+    )
+
+    ollama_base_url: str = Field(
+        default="http://localhost:11434",
+        description="Base URL of the Ollama server"
+    )
+
+    ollama_max_concurrency: int = Field(
+        default=2,
+        description="Ollama calls in flight at once across all requests"
+    )
+
+    ollama_model_affinity: bool = Field(
+        default=True,
+        description="Group queued Ollama calls by model so the loaded model is swapped as rarely as possible"
+    )
+
+    ollama_affinity_limit: int = Field(
+        default=4,
+        description="Calls a loaded model may take in a row before yielding to another waiting model"
+    )
+
     max_retries: int = Field(
         default=3,
         description="Number retries per worker"
     )
 
+    retry_backoff_sec: float = Field(
+        default=0.5,
+        description="First retry delay for a node that hit a transient error; doubles per attempt, with jitter"
+    )
+
+    prefetch_wait_sec: float = Field(
+        default=400.0,
+        description="How long a run waits for a speculative perception started at wake-word time"
+    )
+
+    batch_fetch_concurrency: int = Field(
+        default=4,
+        description="Pages fetched at once by /run/batch"
+    )
+
+    batch_llm_concurrency: int = Field(
+        default=1,
+        description="Model calls in flight at once across /run/batch items"
+    )
+
+    batch_render_concurrency: int = Field(
+        default=2,
+        description="PDFs rendered at once by /run/batch"
+    )
+
+    batch_max_items: int = Field(
+        default=50,
+        description="Largest batch accepted by /run/batch"
+    )
+
+    trace_mode: str = Field(
+        default="off",
+        description="Record external interactions to trace_path ('record'), serve them from it ('replay'), or neither ('off')"
+    )
+
+    trace_path: str = Field(
+        default="./traces/trace.jsonl",
+        description="JSONL trace file used by trace_mode"
+    )
+
+    trace_replay_speed: float = Field(
+        default=0.0,
+        description="When replaying, sleep for the recorded duration times this factor (0 = instant)"
+    )
+
     pdf_output_dir: str = Field(
         default="./outputs",
         description="Directory to save generated PDFs"
     )
 
+    pdf_storage: str = Field(
+        default="disk",
+        description="Where a run's PDF is kept: 'disk' (pdf_output_dir), 'memory', or 'lazy' (rendered into memory on first download)"
+    )
+
+    pdf_cache_mb: int = Field(
+        default=256,
+        description="Memory for PDFs kept for GET /runs/{request_id}/pdf; the least recently used are dropped"
+    )
+
+    def with_profile(self, profile: str) -> "Configuration":
+        """This configuration with ``profile``'s settings swapped in (env-pinned fields kept)."""
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        profiled = {name for settings in PROFILES.values() for name in settings}
+        update = {name: type(self).model_fields[name].default for name in profiled}
+        update.update(PROFILES[profile])
+        update = {k: v for k, v in update.items() if k.upper() not in os.environ}
+        return self.model_copy(update={**update, "profile": profile})
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
@@ -51,4 +183,9 @@ class Configuration(BaseModel):
 
         values = {k: v for k,v in raw_values.items() if v is not None}
 
+        profile = configurable.get("profile") or os.environ.get("PROFILE") or "balanced"
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        values = {**PROFILES[profile], **values, "profile": profile}
+
         return cls(**values)
\ No newline at end of file
@@ -1,24 +1,98 @@
-from langgraph.graph import StateGraph
+from functools import partial
+
+from langgraph.graph import END, StateGraph
 from .state import OverallState
 from .configuration import Configuration
 from .node import AgentNodes
+from .retry import node_retry_policy
+from ..cancellation import cancellable
+from ..metrics import AVOIDED_MODEL_CALLS, instrument_node
+from ..profiling import profile_node
+
+# Model calls each node makes on its normal path.
+MODEL_CALLS = {"perception": 1, "web": 1, "content": 1, "fused": 1}
+
+# Nodes that turn a URL into the document, per Configuration.pipeline.
+SUMMARY_NODES = {"two_stage": ("web", "content"), "fused": ("fused",)}
+
+
+def _wrap(name: str, fn):
+    return instrument_node(name, profile_node(cancellable(fn)))
+
+
+def _skip(*nodes: str):
+    for node in nodes:
+        AVOIDED_MODEL_CALLS.labels(node).inc(MODEL_CALLS[node])
+
+
+def route_after_planning(state: OverallState, summary_nodes=SUMMARY_NODES["two_stage"]) -> str:
+    if state.get("status") == "failed":
+        _skip(*summary_nodes, *(() if state.get("detected_url") else ("perception",)))
+        return "finalize"
+    if state.get("detected_url"):
+        _skip("perception")
+        return "web"
+    return "perception"
 
-def build_graph() -> StateGraph:
-    config = Configuration()
-    nodes = AgentNodes(config)
+
+def route_after_perception(state: OverallState) -> str:
+    if state.get("detected_url") and state.get("status") != "failed":
+        return "web"
+    return "url_fallback"
+
+
+def route_after_url_fallback(state: OverallState, summary_nodes=SUMMARY_NODES["two_stage"]) -> str:
+    if state.get("detected_url") and state.get("status") != "failed":
+        return "web"
+    _skip(*summary_nodes)
+    return "finalize"
+
+
+def route_after_web(state: OverallState) -> str:
+    if state.get("status") == "failed" or not state.get("output_text"):
+        _skip("content")
+        return "finalize"
+    return "content"
+
+
+def build_graph(nodes: AgentNodes | None = None) -> StateGraph:
+    if nodes is None:
+        nodes = AgentNodes(Configuration())
 
     graph = StateGraph(OverallState)
+    retry = node_retry_policy(nodes.config)
 
-    graph.add_node("planning", nodes.planning_node)
-    graph.add_node("perception", nodes.perception_node)
-    graph.add_node("web" , nodes.web_node)
-    graph.add_node("content", nodes.content_node)
+    summary_nodes = SUMMARY_NODES[nodes.config.pipeline]
+    # Routers return "web" for "summarize this URL"; in the fused pipeline that is the fused node.
+    summarize = summary_nodes[0]
+
+    graph.add_node("planning", _wrap("planning", nodes.planning_node), retry_policy=retry)
+    graph.add_node("perception", _wrap("perception", nodes.perception_node), retry_policy=retry)
+    graph.add_node("url_fallback", nodes.url_fallback_node)
+    if nodes.config.pipeline == "fused":
+        graph.add_node("fused", _wrap("fused", nodes.fused_node), retry_policy=retry)
+    else:
+        graph.add_node("web" , _wrap("web", nodes.web_node), retry_policy=retry)
+        graph.add_node("content", _wrap("content", nodes.content_node), retry_policy=retry)
+    graph.add_node("finalize", nodes.finalize_node)
 
     graph.set_entry_point("planning")
-    graph.add_edge("planning", "perception")
-    graph.add_edge("perception", "web")
-    graph.add_edge("web", "content")
+    graph.add_conditional_edges(
+        "planning",
+        partial(route_after_planning, summary_nodes=summary_nodes),
+        {"perception": "perception", "web": summarize, "finalize": "finalize"},
+    )
+    graph.add_conditional_edges("perception", route_after_perception, {"web": summarize, "url_fallback": "url_fallback"})
+    graph.add_conditional_edges(
+        "url_fallback",
+        partial(route_after_url_fallback, summary_nodes=summary_nodes),
+        {"web": summarize, "finalize": "finalize"},
+    )
+    if nodes.config.pipeline == "fused":
+        graph.add_edge("fused", "finalize")
+    else:
+        graph.add_conditional_edges("web", route_after_web, ["content", "finalize"])
+        graph.add_edge("content", "finalize")
+    graph.add_edge("finalize", END)
 
     return graph
-
-    
\ No newline at end of file
@@ -1,8 +1,14 @@
+import hashlib
+import json
+import math
 import re
+import threading
 import httpx
-from typing import Optional
-from langchain_core.messages import HumanMessage
-from langchain_ollama import ChatOllama
+from contextlib import closing
+from functools import partial
+from typing import Callable, Optional
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 
 from .configuration import Configuration
 from .state import OverallState, PerceptionState, WebState, ContentState
@@ -11,21 +17,79 @@ from .prompt import (
     PERCEPTION_MODEL_PROMPT,
     WEB_MODEL_PROMPT,
     CONTENT_MODEL_PROMPT,
+    FUSED_MODEL_PROMPT,
+    PLANNING_TASK,
+    PERCEPTION_TASK,
+    WEB_TASK,
+    CONTENT_TASK,
+    FUSED_TASK,
 )
 
+from .blobs import blob_store
+from .pdfs import pdf_store
+from .budget import IMAGE_TOKENS, Budget, fit_prompt, token_counter
+from .prefetch import prefetch_registry
+from .replay import InteractionTape, interaction_key
+from .retry import is_transient
+from .scheduler import ModelScheduler
+from .singleflight import llm_flight, scrape_flight
+from ..cancellation import RunCancelled, check_cancelled, on_cancel
+from ..metrics import node_scope, span
 from ..tool.screen_streamer import get_current_screen
-from ..tool.webscraper import scrape_and_summarize
-from ..tool.pdf_generator import save_to_pdf
+from ..tool.webscraper import summarize_scraped, web_scraper
+from ..tool.pdf_generator import open_pdf_stream, pdf_generator, render_pdf_bytes, save_to_pdf
 
 
 class AgentNodes:
     def __init__(self, config: Configuration):
         self.config = config
-        self.planning_model = ChatOllama(model=config.planning_model)
-        self.perception_model = ChatOllama(model=config.perception_model)
-        self.web_model = ChatOllama(model=config.web_model)
-        self.content_model = ChatOllama(model=config.content_model)
+        self.tape = InteractionTape(
+            mode=config.trace_mode,
+            path=config.trace_path,
+            replay_speed=config.trace_replay_speed,
+        )
+        self.scheduler = ModelScheduler(
+            max_concurrent=config.ollama_max_concurrency,
+            affinity=config.ollama_model_affinity,
+            affinity_limit=config.ollama_affinity_limit,
+        )
+        self._lock = threading.Lock()
+        self._profiles: dict[str, Configuration] = {}
+        self._chat_models: dict[tuple, object] = {}
+
+    def settings(self, config: Optional[RunnableConfig] = None) -> Configuration:
+        """The Configuration for one request: its profile applied over the defaults."""
+        profile = ((config or {}).get("configurable") or {}).get("profile")
+        if not profile or profile == self.config.profile:
+            return self.config
+        with self._lock:
+            if profile not in self._profiles:
+                self._profiles[profile] = self.config.with_profile(profile)
+            return self._profiles[profile]
+
+    def _chat_model(self, model: str, cfg: Configuration):
+        key = (model, cfg.num_ctx, cfg.num_predict)
+        with self._lock:
+            chat = self._chat_models.get(key)
+            if chat is None:
+                from langchain_ollama import ChatOllama
+
+                chat = ChatOllama(
+                    model=model,
+                    base_url=self.config.ollama_base_url,
+                    num_ctx=cfg.num_ctx,
+                    num_predict=cfg.num_predict,
+                )
+                self._chat_models[key] = chat
+        return chat
+
+    @staticmethod
+    def _ollama_options(cfg: Configuration) -> dict:
+        return {"num_ctx": cfg.num_ctx, "num_predict": cfg.num_predict}
 
+    @staticmethod
+    def _budget(cfg: Configuration) -> Budget:
+        return Budget(num_ctx=cfg.num_ctx, num_predict=cfg.num_predict)
 
     def _extract_url(self, text: str) -> Optional[str]:
         """Extract URL from text - handles multiple formats and patterns."""
@@ -87,45 +151,399 @@ class AgentNodes:
             return ', '.join(keywords[:5]) if keywords else None
         return None
 
-    def _call_llava_with_image(self, prompt: str, image_b64: str) -> str:
+    def _call_llava_with_image(
+        self,
+        prompt: str,
+        image_b64: str,
+        cfg: Optional[Configuration] = None,
+        system: Optional[str] = None,
+    ) -> str:
+        """``system`` is sent ahead of the image and ``prompt``, so Ollama can
+        reuse its cached evaluation across screenshots."""
+        cfg = cfg or self.config
         if image_b64.startswith("data:image"):
             image_b64 = image_b64.split(",")[1]
         
         payload = {
-            "model": self.config.perception_model,
+            "model": cfg.perception_model,
             "prompt": prompt,
             "images": [image_b64],
-            "stream": False,
+            "stream": True,
         }
+        if system:
+            payload["system"] = system
+        options = self._ollama_options(cfg)
+        payload["options"] = options
         
-        resp = httpx.post(
-            "http://localhost:11434/api/generate",
-            json=payload,
-            timeout=400,
+        def post() -> dict:
+            # Streamed so a cancelled run can drop the connection, which makes
+            # Ollama stop generating instead of finishing for nobody.
+            parts, data = [], {}
+            try:
+                with httpx.stream(
+                    "POST",
+                    f"{self.config.ollama_base_url}/api/generate",
+                    json=payload,
+                    timeout=400,
+                ) as resp, on_cancel(resp.close):
+                    resp.raise_for_status()
+                    for line in resp.iter_lines():
+                        check_cancelled()
+                        if line:
+                            data = json.loads(line)
+                            parts.append(data.get("response", ""))
+            except (httpx.HTTPError, httpx.StreamError):
+                check_cancelled()
+                raise
+            return {**data, "response": "".join(parts)}
+
+        def generate() -> dict:
+            return self.scheduler.run(payload["model"], post)
+
+        request = {
+            "model": payload["model"],
+            "system": system,
+            "prompt": prompt,
+            "image_sha256": hashlib.sha256(image_b64.encode()).hexdigest(),
+            "options": options,
+        }
+        key = interaction_key("ollama_generate", request)
+        shared = False
+
+        def coalesced_generate() -> dict:
+            nonlocal shared
+            data, shared = llm_flight.do(key, generate)
+            return data
+
+        estimated = token_counter.count(f"{system or ''}{prompt}", cfg.perception_model) + IMAGE_TOKENS
+        with span("llm", model=cfg.perception_model) as s:
+            data = self.tape.call("ollama_generate", request, coalesced_generate)
+            s.coalesced = shared
+            if not shared:
+                s.tokens(data.get("prompt_eval_count"), data.get("eval_count"))
+        self._log_tokens(
+            s.node, cfg, estimated, data.get("prompt_eval_count"), data.get("eval_count"),
+            data.get("prompt_eval_duration")
         )
-        resp.raise_for_status()
-        data = resp.json()
 
         return data.get("response", "")
 
+    def _invoke_chat(
+        self,
+        role: str,
+        messages: list,
+        cfg: Optional[Configuration] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> AIMessage:
+        """Call the ``role`` chat model (planning, web or content) through the trace tape.
+
+        ``on_text`` receives the output as it is generated; when the answer is
+        replayed or shared with an identical in-flight call it gets it in one piece.
+        """
+        cfg = cfg or self.config
+        model_name = getattr(cfg, f"{role}_model")
+        request = {
+            "model": model_name,
+            "messages": [{"role": m.type, "content": m.content} for m in messages],
+        }
+        request["options"] = self._ollama_options(cfg)
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        estimated = math.ceil(prompt_chars / token_counter.ratio(model_name))
+
+        key = interaction_key("ollama_chat", request)
+        shared = False
+        streamed = False
+
+        def stream() -> AIMessage:
+            nonlocal streamed
+            streamed = on_text is not None
+            model = self._chat_model(model_name, cfg)
+            parts, usage, prompt_eval_ns = [], None, None
+            with closing(model.stream(messages)) as chunks:
+                for chunk in chunks:
+                    check_cancelled()
+                    parts.append(chunk.content)
+                    if on_text:
+                        on_text(chunk.content)
+                    usage = chunk.usage_metadata or usage
+                    prompt_eval_ns = chunk.response_metadata.get("prompt_eval_duration", prompt_eval_ns)
+            return AIMessage(
+                content="".join(parts),
+                usage_metadata=usage,
+                response_metadata={"prompt_eval_duration": prompt_eval_ns}
+            )
+
+        def invoke() -> dict:
+            response = self.scheduler.run(model_name, stream)
+            return {
+                "content": response.content,
+                "usage": dict(response.usage_metadata or {}),
+                "prompt_eval_duration": response.response_metadata.get("prompt_eval_duration"),
+            }
+
+        def coalesced_invoke() -> dict:
+            nonlocal shared
+            data, shared = llm_flight.do(key, invoke)
+            return data
+
+        with span("llm", model=model_name) as s:
+            data = self.tape.call("ollama_chat", request, coalesced_invoke)
+            s.coalesced = shared
+            if not shared:
+                s.tokens(data["usage"].get("input_tokens"), data["usage"].get("output_tokens"))
+                token_counter.observe(model_name, prompt_chars, data["usage"].get("input_tokens"))
+        self._log_tokens(
+            s.node, cfg, estimated, data["usage"].get("input_tokens"), data["usage"].get("output_tokens"),
+            data.get("prompt_eval_duration")
+        )
+        if on_text and not streamed:
+            on_text(data["content"])
+
+        return AIMessage(content=data["content"], usage_metadata=data["usage"] or None)
+
+    @staticmethod
+    def _log_tokens(
+        node: str,
+        cfg: Configuration,
+        estimated: int,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        prompt_eval_ns: Optional[int] = None,
+    ):
+        prompt_eval = f" in {prompt_eval_ns / 1e6:.0f}ms" if prompt_eval_ns is not None else ""
+        print(
+            f"[TOKENS] {node}: prompt {prompt_tokens}{prompt_eval} (estimated {estimated}), "
+            f"completion {completion_tokens}, num_ctx {cfg.num_ctx}, num_predict {cfg.num_predict}"
+        )
 
-    def planning_node(self, state: OverallState) -> OverallState:
+    def _capture_screen(self) -> Optional[str]:
+        return self.tape.call("screen", {}, get_current_screen)
+
+    def _fetch_page(self, url: str) -> tuple[Optional[str], Optional[str]]:
+        def fetch() -> list:
+            title, _, full_content = web_scraper.extract_content(url)
+            return [title, full_content]
+
+        def coalesced_fetch() -> list:
+            data, _ = scrape_flight.do(url, fetch)
+            return data
+
+        title, full_content = self.tape.call("fetch", {"url": url}, coalesced_fetch)
+        return title, full_content
+
+    def _scrape(self, url: str, keyword: Optional[str]) -> dict:
+        with span("scrape"):
+            title, full_content = self._fetch_page(url)
+        return summarize_scraped(url, title, full_content, keyword=keyword)
+
+    def _scrape_for_session(self, session_id: Optional[str], url: str, keyword: Optional[str]) -> dict:
+        """The session's prefetched page if it is for ``url``, otherwise a fresh scrape."""
+        prefetched = prefetch_registry.get(session_id, timeout=0)
+        if prefetched and prefetched.get('detected_url') == url and prefetched.get('full_content'):
+            return summarize_scraped(
+                url,
+                prefetched.get('title'),
+                prefetched.get('full_content'),
+                keyword=keyword
+            )
+        return self._scrape(url, keyword)
+
+    @staticmethod
+    def _length_rule(cfg: Configuration) -> str:
+        return f"\n- Keep it under {cfg.summary_words} words" if cfg.summary_words else ""
+
+    def _planning_messages(self, user_request: str) -> list:
+        return [
+            SystemMessage(content=f"{PLANNING_MODEL_PROMPT}{PLANNING_TASK}"),
+            HumanMessage(content=f"USER REQUEST: {user_request}"),
+        ]
+
+    @staticmethod
+    def _page_text(scraped_data: dict, cfg: Configuration) -> str:
+        """The scraped page cut to the profile's ``web_context_chars``.
+
+        ``extended_text`` is capped at about 2000 characters for the PDF, so
+        the prompt is built from ``full_content`` instead.
+        """
+        page = scraped_data.get('full_content') or scraped_data.get('extended_text', '')
+        return page[:cfg.web_context_chars]
+
+    def _web_messages(self, prompt: str, scraped_data: dict, cfg: Configuration) -> list:
+        system = f"{WEB_MODEL_PROMPT}{WEB_TASK}"
+        request = f"USER REQUEST: {prompt}\nSCRAPED TITLE: {scraped_data.get('title', 'Untitled')}\nSCRAPED CONTENT: "
+        page_text, breakdown = fit_prompt(
+            token_counter,
+            cfg.web_model,
+            self._budget(cfg),
+            {'system_prompt': system, 'request': request},
+            self._page_text(scraped_data, cfg)
+        )
+        print(f"[TOKENS] web prompt budget: {breakdown}")
+        return [SystemMessage(content=system), HumanMessage(content=f"{request}{page_text}")]
+
+    def _content_messages(self, prompt: str, content: str, cfg: Configuration) -> list:
+        system = f"{CONTENT_MODEL_PROMPT}{CONTENT_TASK.format(length_rule=self._length_rule(cfg))}"
+        request = f"USER REQUEST: {prompt}\n\nORIGINAL CONTENT TO FORMAT:\n"
+        cue = "\n\nOUTPUT THE FORMATTED CONTENT NOW (no explanations, just the formatted content):"
+        content_to_process, breakdown = fit_prompt(
+            token_counter,
+            cfg.content_model,
+            self._budget(cfg),
+            {'system_prompt': system, 'request': f"{request}{cue}"},
+            content[:cfg.content_context_chars]
+        )
+        print(f"[TOKENS] content prompt budget: {breakdown}")
+        return [SystemMessage(content=system), HumanMessage(content=f"{request}{content_to_process}{cue}")]
+
+    def _fused_messages(self, prompt: str, scraped_data: dict, cfg: Configuration) -> list:
+        system = f"{FUSED_MODEL_PROMPT}{FUSED_TASK.format(length_rule=self._length_rule(cfg))}"
+        request = f"USER REQUEST: {prompt}\nPAGE TITLE: {scraped_data.get('title', 'Untitled')}\nPAGE CONTENT:\n"
+        cue = "\n\nOUTPUT THE DOCUMENT NOW (no explanations, just the formatted content):"
+        page_text, breakdown = fit_prompt(
+            token_counter,
+            cfg.content_model,
+            self._budget(cfg),
+            {'system_prompt': system, 'request': f"{request}{cue}"},
+            self._page_text(scraped_data, cfg)
+        )
+        print(f"[TOKENS] fused prompt budget: {breakdown}")
+        return [SystemMessage(content=system), HumanMessage(content=f"{request}{page_text}{cue}")]
+
+    def _process_web(self, prompt: str, scraped_data: dict, cfg: Optional[Configuration] = None) -> str:
+        cfg = cfg or self.config
+        response = self._invoke_chat("web", self._web_messages(prompt, scraped_data, cfg), cfg)
+        return str(response.content)
+
+    def _format_content(
+        self,
+        prompt: str,
+        content: str,
+        cfg: Optional[Configuration] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        cfg = cfg or self.config
+        response = self._invoke_chat("content", self._content_messages(prompt, content, cfg), cfg, on_text)
+        return self._document_text(response.content)
+
+    @staticmethod
+    def _document_text(raw_content) -> str:
+        if isinstance(raw_content, list):
+            parts = []
+            for part in raw_content:
+                if isinstance(part, str):
+                    parts.append(part)
+                elif isinstance(part, dict) and "text" in part:
+                    parts.append(str(part["text"]))
+            final_content = " ".join(parts).strip()
+        else:
+            final_content = str(raw_content).strip()
+
+        if final_content.startswith("Here is") or final_content.startswith("Here's"):
+            lines = final_content.split('\n')
+            final_content = '\n'.join(lines[1:]) if len(lines) > 1 else final_content
+
+        return final_content
+
+    def _summarize_fused(
+        self,
+        prompt: str,
+        scraped_data: dict,
+        cfg: Optional[Configuration] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Write the final document straight from the page text in one content model call."""
+        cfg = cfg or self.config
+        response = self._invoke_chat("content", self._fused_messages(prompt, scraped_data, cfg), cfg, on_text)
+        return self._document_text(response.content)
+
+    def _render_pdf(
+        self,
+        title: str,
+        content: str,
+        url: Optional[str],
+        keyword: Optional[str],
+        request_id: Optional[str] = None
+    ) -> dict:
+        with span("pdf") as s:
+            pdf_inputs = {
+                'title': title,
+                'content': content,
+                'url': url,
+                'keyword': keyword,
+            }
+            pdf_result = self.tape.call(
+                "pdf",
+                pdf_inputs,
+                lambda: save_to_pdf(**pdf_inputs, output_dir=self.config.pdf_output_dir, run_id=request_id),
+                passthrough=True
+            )
+            s.error = not pdf_result.get('success')
+        return pdf_result
+
+    def _write_pdf(
+        self,
+        title: str,
+        url: Optional[str],
+        keyword: Optional[str],
+        generate: Callable[[Optional[Callable[[str], None]]], str],
+        request_id: Optional[str] = None,
+        storage: str = "disk",
+    ) -> tuple[str, dict]:
+        """Run ``generate`` with its output laid out into the PDF as it streams in,
+        and register the PDF for download under ``request_id``.
+
+        ``storage`` is a Configuration.pdf_storage value; with "lazy" nothing is
+        rendered now. Returns the generated document and a result dict like
+        ``_render_pdf``'s (with ``deferred`` set for lazy PDFs).
+        """
+        if storage == "lazy":
+            content = generate(None)
+            filename = pdf_generator.generate_meaningful_filename(title, keyword=keyword, url=url, run_id=request_id)
+            if request_id:
+                pdf_store.put_lazy(request_id, filename, partial(render_pdf_bytes, title, content, url, keyword))
+            return content, {'success': True, 'file_path': None, 'filename': filename, 'error': None, 'deferred': True}
+
+        stream = open_pdf_stream(
+            title,
+            url=url,
+            keyword=keyword,
+            output_dir=self.config.pdf_output_dir,
+            in_memory=storage == "memory",
+            run_id=request_id
+        )
         try:
-            user_request = state.get('input_prompt', '')
+            content = generate(stream.write)
+        except BaseException:
+            stream.abort()
+            raise
+
+        with span("pdf") as s:
+            pdf_inputs = {
+                'title': title,
+                'content': content,
+                'url': url,
+                'keyword': keyword,
+            }
+            pdf_result = self.tape.call("pdf", pdf_inputs, stream.close, passthrough=True)
+            s.error = not pdf_result.get('success')
 
-            planning_prompt = f"""{PLANNING_MODEL_PROMPT}
+        if request_id and pdf_result.get('success'):
+            if stream.buffer is not None:
+                pdf_store.put_bytes(request_id, stream.filename, stream.getvalue())
+            else:
+                pdf_store.put_file(request_id, stream.filename, stream.file_path)
+        return content, pdf_result
 
-USER REQUEST: {user_request}
+    def planning_node(self, state: OverallState, config: Optional[RunnableConfig] = None) -> OverallState:
+        try:
+            cfg = self.settings(config)
+            if not cfg.run_planning:
+                state['status'] = 'running'
+                return state
 
-Create a step-by-step plan to accomplish this task:
-1. Analyze current screen
-2. Extract relevant information
-3. Summarize content
-4. Generate PDF
+            user_request = state.get('input_prompt', '')
 
-Provide a brief execution plan."""
-            
-            response=self.planning_model.invoke([HumanMessage(content=planning_prompt)])
+            response = self._invoke_chat("planning", self._planning_messages(user_request), cfg)
             plan = response.content
             
             state['execute_plan'] = str(plan)
@@ -137,13 +555,78 @@ Provide a brief execution plan."""
             return state
         
         except Exception as e:
+            if isinstance(e, RunCancelled) or is_transient(e):
+                raise
             state['status'] = 'failed'
             state.setdefault('errors', []).append(f"Planning node error: {str(e)}")
 
             return state
 
-    def perception_node(self, state: OverallState) -> OverallState:
+    def _perceive(
+        self, screen_image: str, user_query: str, cfg: Optional[Configuration] = None
+    ) -> tuple[str, Optional[str]]:
+        cfg = cfg or self.config
+        direct_prompt = """Look at this screenshot. What URL is displayed in the browser's address bar at the top? Write ONLY the URL, nothing else. If you see 'example.com', write 'example.com'. If you see 'https://example.com', write 'https://example.com'."""
+
+        if cfg.perception_strategy == "direct":
+            response_text = self._call_llava_with_image(direct_prompt, screen_image, cfg)
+            detected_url = self._extract_url(response_text)
+            print(f"[DEBUG] Direct prompt extracted URL: {detected_url}")
+            return str(response_text), detected_url
+
+        response_text = self._call_llava_with_image(
+            f"USER QUERY: {user_query}",
+            screen_image,
+            cfg,
+            system=f"{PERCEPTION_MODEL_PROMPT}{PERCEPTION_TASK}"
+        )
+
+        print(f"[DEBUG] LLaVA response: {response_text[:500]}")
+
+        detected_url = self._extract_url(str(response_text))
+
+        print(f"[DEBUG] Extracted URL: {detected_url}")
+        
+        if not detected_url:
+            direct_response = self._call_llava_with_image(direct_prompt, screen_image, cfg)
+            detected_url = self._extract_url(direct_response)
+            print(f"[DEBUG] Direct prompt extracted URL: {detected_url}")
+
+        return str(response_text), detected_url
+
+    def prefetch(self, session_id: str, profile: Optional[str] = None) -> bool:
+        """Start perception and the page fetch for a session before its /run arrives.
+
+        ``profile`` should be the one the /run will use, so perception runs
+        with its settings.
+        """
+        cfg = self.settings({"configurable": {"profile": profile}})
+        return prefetch_registry.start(session_id, partial(self._speculative_perception, cfg))
+
+    def _speculative_perception(self, cfg: Configuration) -> dict:
+        screen_image = self._capture_screen()
+        if not screen_image:
+            raise RuntimeError("Failed to capture screen")
+
+        with node_scope("prefetch"):
+            response_text, detected_url = self._perceive(screen_image, '', cfg)
+
+            title, full_content = None, None
+            if detected_url:
+                with span("scrape"):
+                    title, full_content = self._fetch_page(detected_url)
+
+        return {
+            'screen_image': screen_image,
+            'screen_analysis': response_text,
+            'detected_url': detected_url,
+            'title': title,
+            'full_content': full_content,
+        }
+
+    def perception_node(self, state: OverallState, config: Optional[RunnableConfig] = None) -> OverallState:
         try:
+            cfg = self.settings(config)
             existing_url = state.get('detected_url')
             if existing_url:
                 state['detected_url'] = existing_url
@@ -158,40 +641,29 @@ Provide a brief execution plan."""
                 'detected_url': None
             }
 
-            screen_image = get_current_screen()
-            if not screen_image:
-                state['status'] = 'failed'
-                state.setdefault('errors',[]).append("Failed to capture screen")
-                return state
+            prefetched = prefetch_registry.get(
+                state.get('session_id'),
+                timeout=self.config.prefetch_wait_sec
+            )
+            if prefetched:
+                screen_image = prefetched['screen_image']
+                response_text = prefetched['screen_analysis']
+                detected_url = prefetched['detected_url']
+                print(f"[DEBUG] Using prefetched perception, URL: {detected_url}")
+            else:
+                screen_image = self._capture_screen()
+                if not screen_image:
+                    state['status'] = 'failed'
+                    state.setdefault('errors',[]).append("Failed to capture screen")
+                    return state
+
+                response_text, detected_url = self._perceive(
+                    screen_image,
+                    perception_state['prompt'] or '',
+                    cfg
+                )
 
             perception_state['screen_image'] = screen_image
-            
-            perception_prompt = f"""{PERCEPTION_MODEL_PROMPT}
-
-USER QUERY: {perception_state['prompt']}
-
-Analyze the screenshot provided and the user query.
-
-Provide:
-1. Description of what's visible on screen
-2. URL: [the URL from the address bar or visible on screen - write it exactly as you see it]
-3. Keywords: [relevant keywords]
-4. Intent: [what the user wants to do]"""
-            
-            response_text = self._call_llava_with_image(perception_prompt, screen_image)
-
-            print(f"[DEBUG] LLaVA response: {response_text[:500]}")
-
-            detected_url = self._extract_url(str(response_text))
-
-            print(f"[DEBUG] Extracted URL: {detected_url}")
-            
-            if not detected_url:
-                direct_prompt = """Look at this screenshot. What URL is displayed in the browser's address bar at the top? Write ONLY the URL, nothing else. If you see 'example.com', write 'example.com'. If you see 'https://example.com', write 'https://example.com'."""
-                direct_response = self._call_llava_with_image(direct_prompt, screen_image)
-                detected_url = self._extract_url(direct_response)
-                print(f"[DEBUG] Direct prompt extracted URL: {detected_url}")
-
             perception_state['screen_analysis'] = str(response_text)
             perception_state['detected_url'] = detected_url
             perception_state['keyword'] = self._extract_keywords(
@@ -199,7 +671,9 @@ Provide:
                 perception_state['prompt'] or ''
             )
 
-            state['screen_image'] = perception_state['screen_image']
+            state['screen_image'] = blob_store.put(
+                state.get('request_id'), 'screen_image', perception_state['screen_image']
+            )
             state['screen_analysis'] = perception_state['screen_analysis']
             state['detected_url'] = perception_state['detected_url']
             state['keyword'] = perception_state['keyword']
@@ -212,13 +686,16 @@ Provide:
             return state
         
         except Exception as e:
+            if isinstance(e, RunCancelled) or is_transient(e):
+                raise
             state['status'] = 'failed'
             state.setdefault('errors', []).append(f"Perception node error: {str(e)}")
 
             return state
 
-    def web_node(self, state: OverallState) -> OverallState:
+    def web_node(self, state: OverallState, config: Optional[RunnableConfig] = None) -> OverallState:
         try:
+            cfg = self.settings(config)
             web_state: WebState = {
                 'url': state.get('detected_url'),
                 'prompt' : state.get('input_prompt', ''),
@@ -233,11 +710,9 @@ Provide:
                 state.setdefault('errors', []).append("No URL detected for web scraping")
                 return state
 
-            scraped_data = scrape_and_summarize(
-                web_state['url'],
-                keyword=web_state['keyword']
+            scraped_data = self._scrape_for_session(
+                state.get('session_id'), web_state['url'], web_state['keyword']
             )
-
             if not scraped_data.get('full_content'):
                 state['status'] = 'failed'
                 state.setdefault('errors', []).append(
@@ -245,17 +720,7 @@ Provide:
                 )
                 return state
 
-            web_prompt = f"""{WEB_MODEL_PROMPT}
-
-USER REQUEST: {web_state['prompt']}
-SCRAPED TITLE: {scraped_data.get('title', 'Untitled')}
-SCRAPED CONTENT: {scraped_data.get('extended_text', '')[:3000]}
-
-Process this web content according to the user's request.
-Extract and format the most relevant information."""
-
-            response = self.web_model.invoke([HumanMessage(content=web_prompt)])
-            processed_content = response.content
+            processed_content = self._process_web(web_state['prompt'], scraped_data, cfg)
 
             web_state['title'] = scraped_data.get('title', 'Untitled')
             web_state['summary'] = scraped_data.get('quick_summary', '')
@@ -265,7 +730,9 @@ Extract and format the most relevant information."""
             state['title'] = web_state['title']
             state['summary'] = web_state['summary']
             state['output_text'] = web_state['output_text']
-            state['output_text_from_url'] = scraped_data.get('full_content', '')
+            state['output_text_from_url'] = blob_store.put(
+                state.get('request_id'), 'output_text_from_url', scraped_data.get('full_content', '')
+            )
 
             state.setdefault('messages', []).append(
                 HumanMessage(content=f"[Web] Scraped and processed: {web_state['url']}")
@@ -275,18 +742,21 @@ Extract and format the most relevant information."""
             return state
 
         except Exception as e:
+            if isinstance(e, RunCancelled) or is_transient(e):
+                raise
             state['status'] = 'failed'
             state.setdefault('errors', []).append(f"Web node error: {str(e)}")
             return state
 
-    def content_node(self, state:OverallState) -> OverallState:
+    def content_node(self, state:OverallState, config: Optional[RunnableConfig] = None) -> OverallState:
         try:
+            cfg = self.settings(config)
             content_state: ContentState = {
                 'prompt': state.get('input_prompt', ''),
                 'title': state.get('title', 'Untitled Document'),
                 'url': state.get('url'),
                 'keyword': state.get('keyword'),
-                'output_text_from_url': state.get('output_text_from_url', ''),
+                'output_text_from_url': blob_store.get(state.get('output_text_from_url')) or '',
                 'pdf_filename': None,
                 'pdf_file_path': None,
                 'pdf_generated': False
@@ -298,49 +768,13 @@ Extract and format the most relevant information."""
                 state.setdefault('errors', []).append("No content available for PDF generation")
                 return state
 
-            content_to_process = content[:4000] if len(content) > 4000 else content
-            
-            content_prompt = f"""{CONTENT_MODEL_PROMPT}
-
-USER REQUEST: {content_state['prompt']}
-
-ORIGINAL CONTENT TO FORMAT:
-{content_to_process}
-
-TASK:
-Transform the above content into a well-structured, readable document.
-- Add clear headings to organize the content
-- Format paragraphs properly
-- Ensure the text flows naturally
-- Make it professional and easy to read
-- Preserve all important information
-
-OUTPUT THE FORMATTED CONTENT NOW (no explanations, just the formatted content):"""
-            
-            response = self.content_model.invoke([HumanMessage(content=content_prompt)])
-            raw_content = response.content
-
-            if isinstance(raw_content, list):
-                parts = []
-                for part in raw_content:
-                    if isinstance(part, str):
-                        parts.append(part)
-                    elif isinstance(part, dict) and "text" in part:
-                        parts.append(str(part["text"]))
-                final_content = " ".join(parts).strip()
-            else:
-                final_content = str(raw_content).strip()
-
-            if final_content.startswith("Here is") or final_content.startswith("Here's"):
-                lines = final_content.split('\n')
-                final_content = '\n'.join(lines[1:]) if len(lines) > 1 else final_content
-
-            pdf_result = save_to_pdf(
-                title = str(content_state['title']),
-                content=str(final_content),
-                url=content_state['url'],
-                keyword=content_state['keyword'],
-                output_dir = self.config.pdf_output_dir
+            _, pdf_result = self._write_pdf(
+                str(content_state['title']),
+                content_state['url'],
+                content_state['keyword'],
+                lambda on_text: self._format_content(content_state['prompt'], content, cfg, on_text),
+                request_id=state.get('request_id'),
+                storage=state.get('pdf_storage') or cfg.pdf_storage
             )
 
             if not pdf_result.get('success'):
@@ -352,7 +786,7 @@ OUTPUT THE FORMATTED CONTENT NOW (no explanations, just the formatted content):"
 
             content_state['pdf_filename'] = pdf_result.get('filename')
             content_state['pdf_file_path'] = pdf_result.get('file_path')
-            content_state['pdf_generated'] = True
+            content_state['pdf_generated'] = not pdf_result.get('deferred')
 
             state['pdf_filename'] = content_state['pdf_filename']
             state['pdf_file_path'] = content_state['pdf_file_path']
@@ -366,6 +800,81 @@ OUTPUT THE FORMATTED CONTENT NOW (no explanations, just the formatted content):"
             return state
 
         except Exception as e:
+            if isinstance(e, RunCancelled) or is_transient(e):
+                raise
             state['status'] = 'failed'
             state.setdefault('errors', []).append(f"Content node error: {str(e)}")
-            return state
\ No newline at end of file
+            return state
+
+    def fused_node(self, state: OverallState, config: Optional[RunnableConfig] = None) -> OverallState:
+        """web_node and content_node in one model call (``pipeline="fused"``)."""
+        try:
+            cfg = self.settings(config)
+            url = state.get('detected_url')
+            if not url:
+                state['status'] = 'failed'
+                state.setdefault('errors', []).append("No URL detected for web scraping")
+                return state
+
+            scraped_data = self._scrape_for_session(state.get('session_id'), url, state.get('keyword'))
+            if not scraped_data.get('full_content'):
+                state['status'] = 'failed'
+                state.setdefault('errors', []).append(f"Failed to scrape content from {url}")
+                return state
+
+            title = scraped_data.get('title', 'Untitled')
+            final_content, pdf_result = self._write_pdf(
+                str(title),
+                url,
+                state.get('keyword'),
+                lambda on_text: self._summarize_fused(state.get('input_prompt', ''), scraped_data, cfg, on_text),
+                request_id=state.get('request_id'),
+                storage=state.get('pdf_storage') or cfg.pdf_storage
+            )
+            if not pdf_result.get('success'):
+                state['status'] = 'failed'
+                state.setdefault('errors', []).append(
+                    f"PDF generation failed: {pdf_result.get('error', 'Unknown error')}"
+                )
+                return state
+
+            state['url'] = url
+            state['title'] = title
+            state['summary'] = scraped_data.get('quick_summary', '')
+            state['output_text'] = final_content
+            state['output_text_from_url'] = blob_store.put(
+                state.get('request_id'), 'output_text_from_url', scraped_data.get('full_content', '')
+            )
+            state['pdf_filename'] = pdf_result.get('filename')
+            state['pdf_file_path'] = pdf_result.get('file_path')
+            state['pdf_generated'] = not pdf_result.get('deferred')
+
+            state.setdefault('messages', []).append(
+                HumanMessage(content=f"[Fused] PDF generated from {url}: {state['pdf_filename']}")
+            )
+            state['status'] = 'completed'
+
+            return state
+
+        except Exception as e:
+            if isinstance(e, RunCancelled) or is_transient(e):
+                raise
+            state['status'] = 'failed'
+            state.setdefault('errors', []).append(f"Fused node error: {str(e)}")
+            return state
+
+    def url_fallback_node(self, state: OverallState) -> dict:
+        """Perception found no URL: fall back to one named in the prompt itself."""
+        url = self._extract_url(state.get('input_prompt', ''))
+        if url:
+            print(f"[DEBUG] Using URL from the prompt: {url}")
+            return {'detected_url': url, 'status': 'running'}
+        return {
+            'status': 'failed',
+            'errors': ["No URL detected on screen or in the prompt"],
+        }
+
+    def finalize_node(self, state: OverallState) -> dict:
+        if state.get('status') == 'completed':
+            return {}
+        return {'status': 'failed'}
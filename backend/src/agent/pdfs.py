@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ..metrics import LAZY_PDFS
+
+PDF_STORAGES = ("disk", "memory", "lazy")
+
+
+@dataclass
+class StoredPDF:
+    filename: str
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+    render: Optional[Callable[[], bytes]] = None
+    etag: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def size(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        return os.path.getsize(self.path) if self.path else 0
+
+
+def file_etag(path: str) -> str:
+    stat = os.stat(path)
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def bytes_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+class PDFStore:
+    """Finished PDFs by request id, served by ``GET /runs/{request_id}/pdf``.
+
+    An entry is a file on disk, a PDF rendered into memory, or a deferred
+    render that runs on the first download, so runs whose PDF is never opened
+    never pay for it. Rendered bytes count against ``max_bytes``; the least
+    recently used entries are dropped beyond that or beyond ``max_entries``.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_entries: int = 1000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, StoredPDF] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put_file(self, request_id: str, filename: str, path: str):
+        self._put(request_id, StoredPDF(filename, path=path, etag=file_etag(path)))
+
+    def put_bytes(self, request_id: str, filename: str, data: bytes):
+        self._put(request_id, StoredPDF(filename, data=data, etag=bytes_etag(data)))
+
+    def put_lazy(self, request_id: str, filename: str, render: Callable[[], bytes]):
+        self._put(request_id, StoredPDF(filename, render=render))
+        LAZY_PDFS.labels("deferred").inc()
+
+    def has(self, request_id: str) -> bool:
+        with self._lock:
+            return request_id in self._entries
+
+    def get(self, request_id: str) -> Optional[StoredPDF]:
+        """The entry for ``request_id``, rendering a deferred PDF first.
+
+        The ETag of a file on disk is taken from the file as it is now, so a
+        changed file never revalidates against a client's old copy.
+        """
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(request_id)
+
+        if entry.path is not None:
+            try:
+                entry.etag = file_etag(entry.path)
+            except OSError:
+                return None
+
+        with entry._lock:
+            if entry.render is not None:
+                data = entry.render()
+                entry.data, entry.etag, entry.render = data, bytes_etag(data), None
+                LAZY_PDFS.labels("rendered").inc()
+                with self._lock:
+                    if self._entries.get(request_id) is entry:
+                        self._bytes += len(data)
+                        self._evict()
+        return entry
+
+    def _put(self, request_id: str, entry: StoredPDF):
+        with self._lock:
+            old = self._entries.pop(request_id, None)
+            if old is not None and old.data is not None:
+                self._bytes -= len(old.data)
+            self._entries[request_id] = entry
+            if entry.data is not None:
+                self._bytes += len(entry.data)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            _, entry = self._entries.popitem(last=False)
+            if entry.data is not None:
+                self._bytes -= len(entry.data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pdfs": len(self._entries), "bytes": self._bytes}
+
+
+pdf_store = PDFStore()
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from ..cancellation import CancelToken, cancel_scope, check_cancelled, on_cancel
+
+
+class PrefetchRegistry:
+    """Speculative perception results keyed by the listener's session id.
+
+    The listener calls ``/prefetch`` as soon as the wake word fires; the later
+    ``/run`` for the same session picks up (or waits for) the result instead
+    of capturing and analysing the screen again.
+
+    Each prefetch runs under its own cancellation token, so discarding it (or
+    cancelling the run waiting for it) closes its Ollama and page downloads.
+    """
+
+    def __init__(self, max_workers: int = 2, ttl_sec: float = 300.0):
+        self.ttl_sec = ttl_sec
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._entries: dict[str, tuple[Future, float, CancelToken]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, session_id: str, fn: Callable[[], dict]) -> bool:
+        with self._lock:
+            self._purge_expired()
+            if session_id in self._entries:
+                return False
+            token = CancelToken(f"prefetch {session_id}")
+            future = self._executor.submit(self._run, token, fn)
+            self._entries[session_id] = (future, time.time(), token)
+        return True
+
+    @staticmethod
+    def _run(token: CancelToken, fn: Callable[[], dict]) -> dict:
+        with cancel_scope(token):
+            check_cancelled()
+            return fn()
+
+    def get(self, session_id: Optional[str], timeout: Optional[float] = None) -> Optional[dict]:
+        if not session_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(session_id)
+        if not entry:
+            return None
+
+        future, _, token = entry
+        if timeout == 0 and not future.done():
+            return None
+
+        # Wait under the caller's run token: cancelling the run stops the wait
+        # and the prefetch it was waiting for.
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+
+        def abort():
+            token.cancel("cancelled with its run")
+            done.set()
+
+        with on_cancel(abort):
+            done.wait(timeout)
+        check_cancelled()
+        if not future.done():
+            print(f"Prefetch for session {session_id} not ready after {timeout}s")
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Prefetch for session {session_id} unusable: {e}")
+            return None
+
+    def discard(self, session_id: Optional[str]):
+        if not session_id:
+            return
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+        if entry:
+            entry[0].cancel()
+            entry[2].cancel("discarded")
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [sid for sid, (_, created, _) in self._entries.items() if now - created > self.ttl_sec]
+        for sid in expired:
+            future, _, token = self._entries.pop(sid)
+            future.cancel()
+            token.cancel("expired")
+
+
+prefetch_registry = PrefetchRegistry()
@@ -0,0 +1,23 @@
+# Named per-request settings, applied on top of the Configuration defaults by
+# Configuration.from_runnable_config. Environment variables still win over a
+# profile, so a deployment can pin e.g. WEB_MODEL for every profile.
+PROFILES: dict[str, dict] = {
+    # Voice requests: skip planning, ask LLaVA only for the URL, short output.
+    "fast": {
+        "run_planning": False,
+        "perception_strategy": "direct",
+        "num_ctx": 2048,
+        "num_predict": 400,
+        "web_context_chars": 2000,
+        "content_context_chars": 2500,
+        "summary_words": 250,
+    },
+    "balanced": {},
+    # Batch jobs: more page context and room for a longer document.
+    "quality": {
+        "num_ctx": 8192,
+        "num_predict": 2048,
+        "web_context_chars": 8000,
+        "content_context_chars": 8000,
+    },
+}
@@ -98,4 +98,72 @@ CRITICAL RULES:
 - Use markdown-style formatting: ## for headings, - for lists, **bold** for emphasis
 - Ensure every sentence is complete and makes sense
 - The output will be converted to PDF, so format it as a proper document
-"""
\ No newline at end of file
+"""
+
+FUSED_MODEL_PROMPT = """
+You are a Content Model that turns a web page into a finished document in one pass.
+
+GOAL:
+Extract what the user asked for from the page and write it up as a polished, human-readable document ready for PDF generation.
+
+RESPONSIBILITIES:
+- Select the information from the page that answers the user's request
+- Organize it with proper structure (headings, paragraphs, lists)
+- Maintain accuracy of the original information
+
+OUTPUT FORMAT REQUIREMENTS:
+- Use clear headings (## Heading) to organize sections
+- Write in complete, well-formed paragraphs
+- Use bullet points or numbered lists when appropriate
+
+CRITICAL RULES:
+- Do not fabricate anything that is not on the page
+- Output ONLY the document - no explanations or meta-commentary
+- Start directly with the content (no "Here is the content:" or similar)
+- Use markdown-style formatting: ## for headings, - for lists, **bold** for emphasis
+"""
+
+# Task instructions. They go into the system message together with the model
+# prompts above, ahead of any per-request text, so the whole static block is an
+# identical prefix on every call and Ollama can reuse its cached evaluation.
+
+PLANNING_TASK = """
+TASK:
+Create a step-by-step plan to accomplish the user's request:
+1. Analyze current screen
+2. Extract relevant information
+3. Summarize content
+4. Generate PDF
+
+Provide a brief execution plan."""
+
+PERCEPTION_TASK = """
+TASK:
+Analyze the screenshot provided and the user query.
+
+Provide:
+1. Description of what's visible on screen
+2. URL: [the URL from the address bar or visible on screen - write it exactly as you see it]
+3. Keywords: [relevant keywords]
+4. Intent: [what the user wants to do]"""
+
+WEB_TASK = """
+TASK:
+Process the web content in the user's message according to the user's request.
+Extract and format the most relevant information."""
+
+CONTENT_TASK = """
+TASK:
+Transform the content in the user's message into a well-structured, readable document.
+- Add clear headings to organize the content
+- Format paragraphs properly
+- Ensure the text flows naturally
+- Make it professional and easy to read
+- Preserve all important information{length_rule}"""
+
+FUSED_TASK = """
+TASK:
+Write a well-structured, readable document from the page content in the user's message that answers the user's request.
+- Add clear headings to organize the content
+- Format paragraphs properly
+- Keep only information that is on the page{length_rule}"""
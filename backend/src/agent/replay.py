@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from ..metrics import current_node
+
+
+class ReplayMissError(RuntimeError):
+    pass
+
+
+def interaction_key(kind: str, request: dict) -> str:
+    raw = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{kind}:{raw}".encode("utf-8")).hexdigest()[:16]
+
+
+class InteractionTape:
+    """Records external interactions to a JSONL trace, or serves them back from one.
+
+    Every call the agent makes to the outside world (screen capture, Ollama,
+    page fetches, PDF rendering) goes through :meth:`call`. In ``record`` mode
+    the request, response and duration are appended to ``path``; in
+    ``replay`` mode the response comes from the trace instead, matched by an
+    exact hash of the request first and otherwise by order within its kind
+    (so runs with changed prompts can still be replayed unless ``strict``).
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        path: Optional[str] = None,
+        replay_speed: float = 0.0,
+        strict: bool = False,
+    ):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown trace mode: {mode}")
+        if mode != "off" and not path:
+            raise ValueError("A trace path is required to record or replay")
+
+        self.mode = mode
+        self.path = path
+        self.replay_speed = replay_speed
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._by_key: dict[str, deque] = {}
+        self._by_kind: dict[str, deque] = {}
+
+        if mode == "record":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        elif mode == "replay":
+            self._load(path)
+
+    def _load(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                event["used"] = False
+                self._by_key.setdefault(event["key"], deque()).append(event)
+                self._by_kind.setdefault(event["kind"], deque()).append(event)
+
+    def call(
+        self,
+        kind: str,
+        request: dict,
+        fn: Callable[[], Any],
+        passthrough: bool = False,
+    ) -> Any:
+        """Run ``fn`` (or replay it). ``passthrough`` calls are always executed;
+        in replay mode their inputs are only checked against the recording."""
+        if self.mode == "off":
+            return fn()
+        if self.mode == "replay":
+            event = self._take(kind, request)
+            if passthrough:
+                return fn()
+            if self.replay_speed > 0:
+                time.sleep(event.get("duration_ms", 0) / 1000 * self.replay_speed)
+            return event["response"]
+
+        start = time.perf_counter()
+        response = fn()
+        self._append({
+            "kind": kind,
+            "key": interaction_key(kind, request),
+            "node": current_node(),
+            "request": request,
+            "response": response,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+        return response
+
+    def _append(self, event: dict):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _take(self, kind: str, request: dict) -> dict:
+        key = interaction_key(kind, request)
+        with self._lock:
+            event = self._pop_unused(self._by_key.get(key))
+            if event is None:
+                if self.strict:
+                    raise ReplayMissError(f"No recorded {kind} interaction matches {key}")
+                event = self._pop_unused(self._by_kind.get(kind))
+                if event is None:
+                    raise ReplayMissError(f"Trace has no more recorded {kind} interactions")
+                print(f"[REPLAY] {kind} request differs from the recording, using next recorded {kind}")
+            event["used"] = True
+            return event
+
+    @staticmethod
+    def _pop_unused(events: Optional[deque]) -> Optional[dict]:
+        while events:
+            event = events.popleft()
+            if not event["used"]:
+                return event
+        return None
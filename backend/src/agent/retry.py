@@ -0,0 +1,29 @@
+import httpx
+from langgraph.types import RetryPolicy
+
+from .configuration import Configuration
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Errors worth retrying the node for: timeouts, dropped connections, 5xx/429 from Ollama."""
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    else:
+        # ollama.ResponseError carries the HTTP status without wrapping httpx
+        status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status >= 500 or status == 429)
+
+
+def node_retry_policy(config: Configuration) -> RetryPolicy:
+    return RetryPolicy(
+        initial_interval=config.retry_backoff_sec,
+        backoff_factor=2.0,
+        max_interval=30.0,
+        max_attempts=config.max_retries + 1,
+        jitter=True,
+        retry_on=is_transient,
+    )
@@ -0,0 +1,145 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from ..cancellation import check_cancelled, on_cancel
+from ..metrics import MODEL_QUEUE_DEPTH, MODEL_QUEUE_WAIT, MODEL_SWAPS
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("lucio_call_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def call_priority(priority: int):
+    """Schedule the model calls made inside this block at ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    model: str = field(compare=False)
+    enqueued: float = field(compare=False)
+    granted: threading.Event = field(compare=False, default_factory=threading.Event)
+    withdrawn: bool = field(compare=False, default=False)
+
+
+class ModelScheduler:
+    """Admission control for Ollama calls, one queue per model.
+
+    At most ``max_concurrent`` calls run at once. Interactive (voice) calls
+    are always admitted before batch calls. With ``affinity`` on, only calls
+    for the model that is already running may join it; a different model
+    waits until those drain, so Ollama swaps models as rarely as possible.
+    To keep a busy model from starving the rest, it yields once it has been
+    granted ``affinity_limit`` calls in a row while another model was waiting.
+    """
+
+    def __init__(self, max_concurrent: int = 2, affinity: bool = True, affinity_limit: int = 4):
+        self.max_concurrent = max_concurrent
+        self.affinity = affinity
+        self.affinity_limit = affinity_limit
+        self._lock = threading.Lock()
+        self._queues: dict[str, list[_Ticket]] = {}
+        self._seq = itertools.count()
+        self._active = 0
+        self._active_models: dict[str, int] = {}
+        self._loaded: Optional[str] = None
+        self._streak = 0
+
+    def run(self, model: str, fn: Callable[[], Any]) -> Any:
+        check_cancelled()
+        ticket = _Ticket(_priority.get(), next(self._seq), model, time.perf_counter())
+        with self._lock:
+            heapq.heappush(self._queues.setdefault(model, []), ticket)
+            MODEL_QUEUE_DEPTH.labels(model).inc()
+            self._dispatch()
+
+        with on_cancel(lambda: self._withdraw(ticket)):
+            ticket.granted.wait()
+        if ticket.withdrawn:
+            check_cancelled()
+        MODEL_QUEUE_WAIT.labels(model, PRIORITY_NAMES[ticket.priority]).observe(
+            time.perf_counter() - ticket.enqueued
+        )
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._active_models[model] -= 1
+                if not self._active_models[model]:
+                    del self._active_models[model]
+                self._dispatch()
+
+    def _withdraw(self, ticket: _Ticket):
+        """Take a cancelled call out of its queue if it has not been admitted yet."""
+        with self._lock:
+            queue = self._queues.get(ticket.model, [])
+            if ticket not in queue:
+                return
+            queue.remove(ticket)
+            heapq.heapify(queue)
+            MODEL_QUEUE_DEPTH.labels(ticket.model).dec()
+            ticket.withdrawn = True
+            ticket.granted.set()
+            self._dispatch()
+
+    def _pick(self) -> Optional[str]:
+        heads = {model: queue[0] for model, queue in self._queues.items() if queue}
+        if not heads:
+            return None
+        urgent = min(t.priority for t in heads.values())
+        candidates = {m: t for m, t in heads.items() if t.priority == urgent}
+
+        if not self.affinity:
+            return min(candidates.values()).model
+
+        if self._active_models:
+            running = next(iter(self._active_models))
+            head = heads.get(running)
+            if head is None or head.priority > urgent:
+                return None
+            if len(heads) > 1 and self._streak >= self.affinity_limit:
+                return None
+            return running
+
+        loaded = candidates.get(self._loaded)
+        if loaded and (len(heads) == 1 or self._streak < self.affinity_limit):
+            return self._loaded
+        others = [t for m, t in candidates.items() if m != self._loaded]
+        return min(others or candidates.values()).model
+
+    def _dispatch(self):
+        while self._active < self.max_concurrent:
+            model = self._pick()
+            if model is None:
+                return
+
+            others_waiting = any(q for m, q in self._queues.items() if q and m != model)
+            ticket = heapq.heappop(self._queues[model])
+            MODEL_QUEUE_DEPTH.labels(model).dec()
+
+            if model != self._loaded:
+                if self._loaded is not None:
+                    MODEL_SWAPS.labels(self._loaded, model).inc()
+                self._loaded = model
+                self._streak = 0
+            self._streak = self._streak + 1 if others_waiting else 0
+
+            self._active += 1
+            self._active_models[model] = self._active_models.get(model, 0) + 1
+            ticket.granted.set()
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from ..cancellation import RunCancelled, check_cancelled, on_cancel
+from ..metrics import SINGLEFLIGHT_CALLS
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs ``fn``; callers that arrive
+    while it is still running wait for the leader's result, or its exception,
+    instead of repeating the work. A follower whose own run is cancelled
+    stops waiting; if the leader's run is cancelled, a follower retries the
+    call instead of failing with it. Nothing is cached: once the leader
+    finishes, the next call with that key runs again.
+    """
+
+    def __init__(self, layer: str):
+        self.layer = layer
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.labels(self.layer, "coalesced").inc()
+            done = threading.Event()
+            future.add_done_callback(lambda _: done.set())
+            with on_cancel(done.set):
+                done.wait()
+            check_cancelled()
+            try:
+                return future.result(), True
+            except RunCancelled:
+                # The leader's run was cancelled, not ours: do the work ourselves.
+                return self.do(key, fn)
+
+        SINGLEFLIGHT_CALLS.labels(self.layer, "executed").inc()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+scrape_flight = SingleFlight("scrape")
+llm_flight = SingleFlight("llm")
@@ -8,10 +8,13 @@ from langgraph.graph import add_messages
 
 class OverallState(TypedDict, total=False):
     request_id: str
+    session_id: Optional[str]
+    profile: Optional[str]
+    pdf_storage: Optional[str]
     input_prompt: str
     execute_plan: str
 
-    screen_image: Optional[str]
+    screen_image: Optional[str]  # blob_store handle
     prompt: Optional[str]
     screen_analysis: Optional[str]
     keyword: Optional[str]
@@ -22,7 +25,7 @@ class OverallState(TypedDict, total=False):
     summary: Optional[str]
     output_text: Optional[str]
 
-    output_text_from_url: Optional[str]
+    output_text_from_url: Optional[str]  # blob_store handle
     pdf_filename: Optional[str]
     pdf_file_path: Optional[str]
     pdf_generated: bool
@@ -1,26 +1,56 @@
+from contextlib import asynccontextmanager
+from typing import Any, Optional
 from uuid import uuid4
+import asyncio
 import json
+import os
+import re
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-from .tool.screen_streamer import start_screen_stream
-from .agent.graph import build_graph
-from .agent.state import OverallState
-from .db import init_db, SessionLocal, Conversation
+from . import startup
+from .cancellation import RunCancelled, run_registry
+from .metrics import RUNS_CANCELLED, finish_trace, render_latest, span, start_trace
+from .profiling import finish_profiling, start_profiling
 
 
 load_dotenv()
-init_db()
 
-start_screen_stream(interval=1.0)
 
-workflow = build_graph().compile()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    readiness = startup.Readiness(["database", "screen_stream", "graph"])
+    app.state.readiness = readiness
+    app.state.nodes = None
+    app.state.workflow = None
+    app.state.batch_runner = None
+    app.state.runs = None
 
-app = FastAPI(title="Lucio Agent API")
+    def start_graph():
+        nodes, workflow = startup.build_workflow()
+        app.state.runs = startup.build_resumable_runs(workflow)
+        app.state.batch_runner = startup.build_batch_runner(nodes)
+        app.state.nodes, app.state.workflow = nodes, workflow
+
+    # Start the components in the background so the server accepts requests
+    # (and /ready reports progress) while they come up.
+    starting = asyncio.gather(
+        readiness.run("database", startup.start_database),
+        readiness.run("screen_stream", startup.start_screen_stream, 1.0),
+        readiness.run("graph", start_graph),
+    )
+
+    yield
+
+    await starting
+    await asyncio.to_thread(startup.shutdown, readiness)
+
+
+app = FastAPI(title="Lucio Agent API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,9 +61,67 @@ app.add_middleware(
 )
 
 
+def profiling_requested(requested: bool, request: Request) -> bool:
+    header = request.headers.get("x-lucio-profiling", "")
+    return requested or header.strip().lower() in ("1", "true", "yes", "on")
+
+
+def require_profile(profile: str | None):
+    from .agent.profiles import PROFILES
+
+    if profile and profile not in PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown profile {profile}; choose from {', '.join(PROFILES)}")
+
+
+def require_pdf_storage(pdf_storage: str | None):
+    from .agent.pdfs import PDF_STORAGES
+
+    if pdf_storage and pdf_storage not in PDF_STORAGES:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown pdf_storage {pdf_storage}; choose from {', '.join(PDF_STORAGES)}"
+        )
+
+
+def require_ready(request: Request, *components: str):
+    readiness = request.app.state.readiness
+    missing = [name for name in components if not readiness.is_ready(name)]
+    if missing:
+        raise HTTPException(status_code=503, detail=f"Not ready: {', '.join(missing)}")
+
+
 class RunRequest(BaseModel):
     prompt: str
+    request_id: str | None = None
     url: str | None = None
+    session_id: str | None = None
+    profile: str | None = None
+    pdf_storage: str | None = None
+    profiling: bool = False
+
+
+class BatchItemRequest(BaseModel):
+    url: str
+    prompt: str | None = None
+
+
+class BatchRunRequest(BaseModel):
+    items: list[str | BatchItemRequest]
+    profile: str = "quality"
+
+
+class PrefetchRequest(BaseModel):
+    session_id: str
+    profile: str | None = None
+
+
+class PrefetchResponse(BaseModel):
+    session_id: str
+    started: bool
+
+
+class CancelResponse(BaseModel):
+    request_id: str
+    cancelled: bool
 
 
 class RunResponse(BaseModel):
@@ -41,28 +129,21 @@ class RunResponse(BaseModel):
     status: str
     pdf_file_path: str | None = None
     pdf_generated: bool = False
+    pdf_url: str | None = None
     errors: list[str] = []
+    resumable: bool = False
+    timings: dict[str, Any] = {}
+    profile_path: str | None = None
 
 
-@app.post("/run", response_model=RunResponse)
-def run_agent(req: RunRequest) -> RunResponse:
-    request_id = str(uuid4())
-    initial_state: OverallState = {
-        "request_id": request_id,
-        "input_prompt": req.prompt,
-        "detected_url": req.url,
-        "status": "pending",
-        "messages": [],
-        "errors": [],
-    }
-
-    final_state = workflow.invoke(initial_state)
+def save_conversation(request_id: str, prompt: str, final_state: dict) -> None:
+    from .db import SessionLocal, Conversation
 
-    db: Session = SessionLocal()
+    db = SessionLocal()
     try:
         conv = Conversation(
             request_id=request_id,
-            prompt=req.prompt,
+            prompt=prompt,
             url=final_state.get("url"),
             status=final_state.get("status", "unknown"),
             pdf_file_path=final_state.get("pdf_file_path"),
@@ -74,10 +155,308 @@ def run_agent(req: RunRequest) -> RunResponse:
     finally:
         db.close()
 
+
+def conversation_pdf(request_id: str) -> Optional[str]:
+    """Path of a PDF from an earlier run, if its file is still on disk."""
+    from .db import SessionLocal, Conversation
+
+    db = SessionLocal()
+    try:
+        conv = db.query(Conversation).filter(Conversation.request_id == request_id).first()
+        path = conv.pdf_file_path if conv else None
+    finally:
+        db.close()
+    return path if path and os.path.isfile(path) else None
+
+
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Inclusive ``(start, end)`` of a single ``bytes=`` range. None means the
+    header should be ignored (malformed, or several ranges); raises ValueError
+    when the range lies beyond the end of the file."""
+    match = BYTE_RANGE.match(header.strip())
+    if not match or not (match[1] or match[2]):
+        return None
+    if match[1]:
+        start = int(match[1])
+        end = int(match[2]) if match[2] else size - 1
+        if match[2] and end < start:
+            return None
+    else:
+        start, end = size - int(match[2]), size - 1
+    start, end = max(start, 0), min(end, size - 1)
+    if start > end:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def iter_file(path: str, start: int, length: int, chunk_size: int = 64 * 1024):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def pdf_response(request: Request, pdf) -> Response:
+    headers = {
+        "ETag": pdf.etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": f'inline; filename="{pdf.filename}"',
+    }
+    if etag_matches(request.headers.get("if-none-match"), pdf.etag):
+        return Response(status_code=304, headers=headers)
+
+    size = pdf.size
+    byte_range = None
+    range_header = request.headers.get("range")
+    # A stale If-Range means the client's partial copy is outdated: send it all.
+    if range_header and etag_matches(request.headers.get("if-range", pdf.etag), pdf.etag):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status = 200
+    if byte_range:
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    if pdf.data is not None:
+        return Response(pdf.data[start:end + 1], status_code=status, headers=headers, media_type="application/pdf")
+    return StreamingResponse(
+        iter_file(pdf.path, start, end - start + 1), status_code=status, headers=headers, media_type="application/pdf"
+    )
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/ready")
+def ready(request: Request) -> JSONResponse:
+    readiness = request.app.state.readiness
+    return JSONResponse(readiness.snapshot(), status_code=200 if readiness.ready else 503)
+
+
+@app.post("/prefetch", response_model=PrefetchResponse, status_code=202)
+def prefetch(req: PrefetchRequest, request: Request) -> PrefetchResponse:
+    require_ready(request, "graph", "screen_stream")
+    require_profile(req.profile)
+    started = request.app.state.nodes.prefetch(req.session_id, req.profile)
+    return PrefetchResponse(session_id=req.session_id, started=started)
+
+
+def invoke_workflow(
+    request: Request, request_id: str, graph_input: dict | None, profile: str | None
+) -> tuple[dict, bool]:
+    """Run (or resume) the graph for ``request_id``; returns the final state and
+    whether it stopped on an error that left a resumable checkpoint."""
+    workflow = request.app.state.workflow
+    runs = request.app.state.runs
+    config = runs.config(request_id, profile)
+
+    try:
+        final_state = workflow.invoke(graph_input, config)
+    except RunCancelled as e:
+        snapshot = workflow.get_state(config)
+        RUNS_CANCELLED.labels(snapshot.next[0] if snapshot.next else "unknown").inc()
+        final_state = dict(snapshot.values)
+        final_state["status"] = "cancelled"
+        final_state["errors"] = list(final_state.get("errors", [])) + [str(e)]
+        runs.finished(request_id, resumable=False)
+        return final_state, False
+    except Exception as e:
+        snapshot = workflow.get_state(config)
+        failed_node = snapshot.next[0] if snapshot.next else "unknown"
+        attempts = request.app.state.nodes.config.max_retries + 1
+        final_state = dict(snapshot.values)
+        final_state["status"] = "failed"
+        final_state["errors"] = list(final_state.get("errors", [])) + [
+            f"{failed_node} node failed after {attempts} attempts: {e}"
+        ]
+        runs.finished(request_id, resumable=bool(snapshot.next))
+        return final_state, bool(snapshot.next)
+
+    runs.finished(request_id, resumable=False)
+    return final_state, False
+
+
+def execute_run(
+    request: Request,
+    request_id: str,
+    prompt: str,
+    graph_input: dict | None,
+    profiling: bool,
+    profile: str | None = None,
+    session_id: str | None = None,
+) -> RunResponse:
+    from .agent.blobs import blob_store
+    from .agent.pdfs import pdf_store
+    from .agent.prefetch import prefetch_registry
+
+    try:
+        run_registry.start(request_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    profile_path = None
+    if profiling:
+        start_profiling(request_id)
+
+    start_trace(request_id)
+    try:
+        final_state, resumable = invoke_workflow(request, request_id, graph_input, profile)
+
+        with span("db_write", node="app", request_id=request_id):
+            save_conversation(request_id, prompt, final_state)
+    finally:
+        run_registry.finish(request_id)
+        prefetch_registry.discard(session_id)
+        if not request.app.state.runs.is_resumable(request_id):
+            blob_store.release(request_id)
+        trace = finish_trace(request_id)
+        if profiling:
+            output_dir = request.app.state.nodes.config.pdf_output_dir
+            profile_path = finish_profiling(request_id, output_dir)
+
     return RunResponse(
         request_id=request_id,
         status=final_state.get("status", "unknown"),
         pdf_file_path=final_state.get("pdf_file_path"),
         pdf_generated=bool(final_state.get("pdf_generated", False)),
+        pdf_url=f"/runs/{request_id}/pdf" if pdf_store.has(request_id) else None,
         errors=final_state.get("errors", []),
-    )
\ No newline at end of file
+        resumable=resumable,
+        timings=trace.breakdown() if trace else {},
+        profile_path=profile_path,
+    )
+
+
+@app.post("/run", response_model=RunResponse)
+def run_agent(req: RunRequest, request: Request) -> RunResponse:
+    require_ready(request, "graph", "database")
+    require_profile(req.profile)
+    require_pdf_storage(req.pdf_storage)
+
+    request_id = req.request_id or str(uuid4())
+    initial_state = {
+        "request_id": request_id,
+        "session_id": req.session_id,
+        "profile": req.profile,
+        "pdf_storage": req.pdf_storage,
+        "input_prompt": req.prompt,
+        "detected_url": req.url,
+        "status": "pending",
+        "messages": [],
+        "errors": [],
+    }
+    return execute_run(
+        request,
+        request_id,
+        req.prompt,
+        initial_state,
+        profiling_requested(req.profiling, request),
+        profile=req.profile,
+        session_id=req.session_id,
+    )
+
+
+@app.post("/run/{request_id}/resume", response_model=RunResponse)
+def resume_run(request_id: str, request: Request, profiling: bool = False) -> RunResponse:
+    """Continue a run that failed on a transient error from its checkpoint."""
+    require_ready(request, "graph", "database")
+    if not request.app.state.runs.is_resumable(request_id):
+        raise HTTPException(status_code=404, detail=f"No resumable run {request_id}")
+
+    snapshot = request.app.state.workflow.get_state(request.app.state.runs.config(request_id))
+    return execute_run(
+        request,
+        request_id,
+        snapshot.values.get("input_prompt", ""),
+        None,
+        profiling_requested(profiling, request),
+        profile=snapshot.values.get("profile"),
+    )
+
+
+@app.get("/runs/{request_id}/pdf")
+def download_pdf(request_id: str, request: Request) -> Response:
+    """The run's PDF, with ETag revalidation and single byte-range requests.
+
+    PDFs kept by ``pdf_storage="lazy"`` are rendered by the first download.
+    """
+    from .agent.pdfs import StoredPDF, file_etag, pdf_store
+
+    try:
+        pdf = pdf_store.get(request_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF rendering failed: {e}")
+
+    if pdf is None and request.app.state.readiness.is_ready("database"):
+        path = conversation_pdf(request_id)
+        if path:
+            pdf = StoredPDF(os.path.basename(path), path=path, etag=file_etag(path))
+    if pdf is None or (pdf.data is None and not os.path.isfile(pdf.path)):
+        raise HTTPException(status_code=404, detail=f"No PDF for run {request_id}")
+    return pdf_response(request, pdf)
+
+
+@app.delete("/run/{request_id}", response_model=CancelResponse, status_code=202)
+def cancel_run(request_id: str, reason: str = "cancelled by client") -> CancelResponse:
+    """Stop a run in progress; its /run call returns with status ``cancelled``."""
+    if not run_registry.cancel(request_id, reason):
+        raise HTTPException(status_code=404, detail=f"No run in progress with id {request_id}")
+    return CancelResponse(request_id=request_id, cancelled=True)
+
+
+@app.post("/run/batch")
+def run_batch(req: BatchRunRequest, request: Request) -> StreamingResponse:
+    """Summarize many URLs without perception, streaming one NDJSON event per item update."""
+    require_ready(request, "graph", "database")
+    require_profile(req.profile)
+    from .agent.batch import DEFAULT_BATCH_PROMPT, BatchItem
+
+    max_items = request.app.state.nodes.config.batch_max_items
+    if not req.items:
+        raise HTTPException(status_code=400, detail="No items to run")
+    if len(req.items) > max_items:
+        raise HTTPException(status_code=400, detail=f"At most {max_items} items per batch")
+
+    items = [
+        BatchItem(url=item) if isinstance(item, str) else BatchItem(url=item.url, prompt=item.prompt)
+        for item in req.items
+    ]
+    runner = request.app.state.batch_runner
+
+    def stream():
+        for event in runner.run(items, req.profile):
+            if event["status"] in ("completed", "failed"):
+                item = items[event["index"]]
+                save_conversation(event["request_id"], item.prompt or DEFAULT_BATCH_PROMPT, {
+                    "url": item.url,
+                    "status": event["status"],
+                    "pdf_file_path": event.get("pdf_file_path"),
+                    "pdf_generated": event["status"] == "completed",
+                    "errors": [event["error"]] if "error" in event else [],
+                })
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
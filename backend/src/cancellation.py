@@ -0,0 +1,146 @@
+import contextvars
+import itertools
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Optional
+
+
+class RunCancelled(Exception):
+    """Raised inside a run once its cancellation token has been set."""
+
+
+class CancelToken:
+    """Cancellation flag for one run.
+
+    Code that blocks (an HTTP stream, a queue wait) registers a callback with
+    ``on_cancel`` for as long as it blocks; ``cancel`` runs those callbacks so
+    the blocked call returns right away instead of at its next ``check``.
+    """
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[DEBUG] Cancel callback for run {self.request_id} failed: {e}")
+        return True
+
+    def check(self):
+        if self._event.is_set():
+            raise RunCancelled(f"Run {self.request_id} {self.reason}")
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]):
+        """Run ``callback`` on cancellation while inside this block (at once if
+        the run is already cancelled)."""
+        with self._lock:
+            key = next(self._ids)
+            already = self._event.is_set()
+            if not already:
+                self._callbacks[key] = callback
+        if already:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.pop(key, None)
+
+
+class RunRegistry:
+    """Cancellation tokens of the runs currently in progress, by request id."""
+
+    def __init__(self):
+        self._tokens: dict[str, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def start(self, request_id: str) -> CancelToken:
+        with self._lock:
+            if request_id in self._tokens:
+                raise ValueError(f"Run {request_id} is already in progress")
+            token = self._tokens[request_id] = CancelToken(request_id)
+            return token
+
+    def get(self, request_id: Optional[str]) -> Optional[CancelToken]:
+        with self._lock:
+            return self._tokens.get(request_id)
+
+    def cancel(self, request_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a run in progress; False if there is no such run."""
+        token = self.get(request_id)
+        if token is None:
+            return False
+        token.cancel(reason)
+        return True
+
+    def finish(self, request_id: str):
+        with self._lock:
+            self._tokens.pop(request_id, None)
+
+
+_current: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "lucio_cancel_token", default=None
+)
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken]):
+    """Make ``token`` the one checked by the code running inside this block."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def check_cancelled():
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+@contextmanager
+def on_cancel(callback: Callable[[], None]):
+    """Call ``callback`` if the current run is cancelled while inside this block."""
+    token = _current.get()
+    if token is None:
+        yield
+        return
+    with token.on_cancel(callback):
+        yield
+
+
+def cancellable(fn):
+    """Run a graph node under its run's token, checking it before the node starts."""
+
+    @wraps(fn)
+    def wrapper(state, *args, **kwargs):
+        with cancel_scope(run_registry.get(state.get("request_id"))):
+            check_cancelled()
+            return fn(state, *args, **kwargs)
+
+    return wrapper
+
+
+run_registry = RunRegistry()
@@ -1,47 +1,42 @@
 import os
-import time
-import wave
-import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from uuid import uuid4
 
 import numpy as np
-import requests
 
 import pvporcupine
 import pyaudio
 
-from faster_whisper import WhisperModel
 from dotenv import load_dotenv
 
+from .voice.agent_client import AgentClient
+from .voice.endpointing import Endpointer, EndpointerConfig, PreRollBuffer
+from .voice.transcription import (
+    StreamingTranscriber,
+    TranscriptionConfig,
+    TranscriptionEngine,
+    pcm16_to_float32,
+)
+
 load_dotenv()
 
 @dataclass
 class Config:
     api_url: str = "http://127.0.0.1:8000/run"
+    prefetch_url: str | None = "http://127.0.0.1:8000/prefetch"
     hotword: str = "lucio"
     sample_rate: int = 16000
     channels: int = 1
     record_seconds: int = 30
     silence_timeout_sec: float = 1.2
-    whisper_model: str = "small"
-
-def post_to_agent(api_url: str, prompt: str) -> dict:
-    r = requests.post(api_url, json={"prompt": prompt}, timeout=600)
-    r.raise_for_status()
-    return r.json()
-
-def save_wav(path:str, pcm16: bytes, sample_rate: int, channels: int = 1):
-    with wave.open(path, "wb") as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(pcm16)
-
-def rms_int16(pcm: np.ndarray) -> float:
-    if pcm.size == 0:
-        return 0.0
-    x = pcm.astype(np.float32)
-    return float(np.sqrt(np.mean(x * x)))
+    pre_roll_sec: float = 0.3
+    vad_aggressiveness: int | None = None
+    transcription: TranscriptionConfig = field(default_factory=TranscriptionConfig.from_env)
+    streaming_transcription: bool = True
+    streaming_step_sec: float = 1.0
+    submit_policy: str = "replace"
+    max_pending_requests: int = 2
+    agent_profile: str = "fast"
 
 def main():
     access_key = os.environ.get("PICOVOICE_ACCESS_KEY")
@@ -64,7 +59,27 @@ def main():
         frames_per_buffer=porcupine.frame_length,
     )
 
-    whisper = WhisperModel(cfg.whisper_model, device="cpu", compute_type="int8")
+    engine = TranscriptionEngine(cfg.transcription)
+    streamer = StreamingTranscriber(
+        engine,
+        sample_rate=cfg.sample_rate,
+        step_sec=cfg.streaming_step_sec,
+    )
+    endpointer = Endpointer(EndpointerConfig(
+        sample_rate=cfg.sample_rate,
+        max_hangover_sec=cfg.silence_timeout_sec,
+        max_record_sec=cfg.record_seconds,
+        vad_aggressiveness=cfg.vad_aggressiveness,
+    ))
+    pre_roll = PreRollBuffer(cfg.pre_roll_sec, porcupine.frame_length, cfg.sample_rate)
+    agent = AgentClient(
+        cfg.api_url,
+        prefetch_url=cfg.prefetch_url,
+        policy=cfg.submit_policy,
+        max_pending=cfg.max_pending_requests,
+        profile=cfg.agent_profile,
+    )
+    agent.start()
 
     print("Listener started. Say 'Lucio' to wake me up.")
     try:
@@ -74,38 +89,34 @@ def main():
 
             keyword_index = porcupine.process(list(frame))
             if keyword_index < 0:
+                pre_roll.append(pcm)
+                endpointer.calibrate(frame)
                 continue
 
             print("Wake word detected. Listening for request...")
+            session_id = str(uuid4())
+            agent.prefetch(session_id)
 
-            recorded = bytearray()
-            last_voice_time = time.time()
+            recorded = bytearray(pre_roll.drain())
+            endpointer.reset()
+            if cfg.streaming_transcription:
+                streamer.start()
+                streamer.feed(bytes(recorded))
 
-            start_time = time.time()
             while True:
                 pcm2 = stream.read(porcupine.frame_length, exception_on_overflow=False)
                 frame2 = np.frombuffer(pcm2, dtype=np.int16)
                 recorded.extend(pcm2)
+                if cfg.streaming_transcription:
+                    streamer.feed(pcm2)
 
-                energy = rms_int16(frame2)
-                if energy > 300:
-                    last_voice_time = time.time()
-                if time.time() - start_time >= cfg.record_seconds:
-                    break
-                if time.time() - last_voice_time >= cfg.silence_timeout_sec:
+                if endpointer.process(frame2):
                     break
 
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                wav_path = f.name
-            save_wav(wav_path, bytes(recorded), cfg.sample_rate, cfg.channels)
-
-            segments, info = whisper.transcribe(wav_path, language=None)
-            text = " ".join(seg.text.strip() for seg in segments).strip()
-
-            try:
-                os.remove(wav_path)
-            except OSError:
-                pass
+            if cfg.streaming_transcription:
+                text = streamer.finish()
+            else:
+                text = engine.transcribe_text(pcm16_to_float32(bytes(recorded)))
 
             if not text:
                 print("No speech detected. Say 'Lucio' again.")
@@ -113,18 +124,10 @@ def main():
 
             print("Heard:", text)
 
-            try:
-                result = post_to_agent(cfg.api_url, text)
-                print("Agent status:", result.get("status"))
-                print("PDF:", result.get("pdf_file_path"))
-                if result.get("errors"):
-                    print("Errors:", result.get("errors"))
-            except Exception as e:
-                print("Failed calling agent:", e)
-
-            time.sleep(0.5)
+            agent.submit(text, session_id=session_id)
 
     finally:
+        agent.stop()
         stream.stop_stream()
         stream.close()
         pa.terminate()
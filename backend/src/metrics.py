@@ -0,0 +1,236 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Callable, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+NODE_DURATION = Histogram(
+    "lucio_node_duration_seconds",
+    "Time spent in each agent graph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+OPERATION_DURATION = Histogram(
+    "lucio_operation_duration_seconds",
+    "Time spent in LLM calls, scrapes, PDF builds and database writes",
+    ["operation", "node", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "lucio_llm_tokens_total",
+    "Prompt and completion tokens reported by Ollama",
+    ["node", "model", "kind"],
+)
+MODEL_QUEUE_WAIT = Histogram(
+    "lucio_model_queue_wait_seconds",
+    "Time an Ollama call waited in the model scheduler before being sent",
+    ["model", "priority"],
+    buckets=LATENCY_BUCKETS,
+)
+MODEL_QUEUE_DEPTH = Gauge(
+    "lucio_model_queue_depth",
+    "Ollama calls waiting in the model scheduler",
+    ["model"],
+)
+MODEL_SWAPS = Counter(
+    "lucio_model_swaps_total",
+    "Times the model scheduler switched Ollama from one model to another",
+    ["from_model", "to_model"],
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "lucio_singleflight_calls_total",
+    "Scrapes and LLM calls that were executed or coalesced onto an identical in-flight call",
+    ["layer", "result"],
+)
+AVOIDED_MODEL_CALLS = Counter(
+    "lucio_avoided_model_calls_total",
+    "Model calls not made because routing skipped the node that would make them",
+    ["node"],
+)
+RUNS_CANCELLED = Counter(
+    "lucio_runs_cancelled_total",
+    "Runs stopped by DELETE /run/{request_id}, by the node they were in",
+    ["node"],
+)
+LAZY_PDFS = Counter(
+    "lucio_lazy_pdfs_total",
+    "PDFs deferred to their first download, and how many of those were then rendered",
+    ["result"],
+)
+ERRORS = Counter(
+    "lucio_errors_total",
+    "Failed graph nodes and operations",
+    ["node", "operation"],
+)
+
+
+@dataclass
+class SpanRecord:
+    operation: str
+    node: str
+    model: str = ""
+    duration_ms: float = 0.0
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    error: bool = False
+    coalesced: bool = False
+
+    def tokens(self, prompt: Optional[int], completion: Optional[int]):
+        self.prompt_tokens = prompt
+        self.completion_tokens = completion
+
+
+class RequestTrace:
+    """Spans recorded for one /run request, returned in its response."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.spans: list[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: SpanRecord):
+        with self._lock:
+            self.spans.append(record)
+
+    def breakdown(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+
+        nodes: dict[str, float] = {}
+        prompt_tokens = completion_tokens = 0
+        for s in spans:
+            if s.operation == "node":
+                nodes[s.node] = round(nodes.get(s.node, 0.0) + s.duration_ms, 2)
+            prompt_tokens += s.prompt_tokens or 0
+            completion_tokens += s.completion_tokens or 0
+
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "nodes": nodes,
+            "tokens": {"prompt": prompt_tokens, "completion": completion_tokens},
+            "spans": [asdict(s) for s in spans],
+        }
+
+
+@dataclass
+class _NodeContext:
+    node: str
+    trace: Optional[RequestTrace]
+
+
+_traces: dict[str, RequestTrace] = {}
+_traces_lock = threading.Lock()
+_current: contextvars.ContextVar[Optional[_NodeContext]] = contextvars.ContextVar(
+    "lucio_current_node", default=None
+)
+
+
+def start_trace(request_id: str) -> RequestTrace:
+    trace = RequestTrace(request_id)
+    with _traces_lock:
+        _traces[request_id] = trace
+    return trace
+
+
+def get_trace(request_id: Optional[str]) -> Optional[RequestTrace]:
+    if not request_id:
+        return None
+    with _traces_lock:
+        return _traces.get(request_id)
+
+
+def finish_trace(request_id: str) -> Optional[RequestTrace]:
+    with _traces_lock:
+        return _traces.pop(request_id, None)
+
+
+def current_node() -> Optional[str]:
+    ctx = _current.get()
+    return ctx.node if ctx else None
+
+
+@contextmanager
+def node_scope(name: str, request_id: Optional[str] = None):
+    """Label spans opened outside the graph (e.g. prefetch) with ``name``."""
+    token = _current.set(_NodeContext(name, get_trace(request_id)))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(
+    operation: str,
+    model: Optional[str] = None,
+    node: Optional[str] = None,
+    request_id: Optional[str] = None,
+):
+    """Time an operation, labelled with the graph node it runs in."""
+    ctx = _current.get()
+    trace = get_trace(request_id) if request_id else (ctx.trace if ctx else None)
+    record = SpanRecord(
+        operation=operation,
+        node=node or (ctx.node if ctx else "none"),
+        model=model or "",
+    )
+
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        record.duration_ms = round(elapsed * 1000, 2)
+        OPERATION_DURATION.labels(record.operation, record.node, record.model).observe(elapsed)
+        if record.error:
+            ERRORS.labels(record.node, record.operation).inc()
+        if record.prompt_tokens:
+            LLM_TOKENS.labels(record.node, record.model, "prompt").inc(record.prompt_tokens)
+        if record.completion_tokens:
+            LLM_TOKENS.labels(record.node, record.model, "completion").inc(record.completion_tokens)
+        if trace:
+            trace.add(record)
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wrap a graph node so its duration and failures are recorded."""
+
+    @wraps(fn)
+    def wrapper(state, *args, **kwargs):
+        trace = get_trace(state.get("request_id"))
+        token = _current.set(_NodeContext(name, trace))
+        record = SpanRecord(operation="node", node=name)
+        start = time.perf_counter()
+        try:
+            result = fn(state, *args, **kwargs)
+            if isinstance(result, dict) and result.get("status") == "failed":
+                record.error = True
+            return result
+        except BaseException:
+            record.error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            record.duration_ms = round(elapsed * 1000, 2)
+            NODE_DURATION.labels(name).observe(elapsed)
+            if record.error:
+                ERRORS.labels(name, "node").inc()
+            if trace:
+                trace.add(record)
+            _current.reset(token)
+
+    return wrapper
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
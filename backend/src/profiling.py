@@ -0,0 +1,85 @@
+import cProfile
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Optional
+
+
+class ProfileSession:
+    """Collects cProfile stats for one request across the threads its nodes run in."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile):
+        with self._lock:
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def dump(self, output_dir: str) -> Optional[str]:
+        with self._lock:
+            if self.stats is None:
+                return None
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, f"{self.request_id}.prof")
+            self.stats.dump_stats(path)
+            return path
+
+
+_sessions: dict[str, ProfileSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def start_profiling(request_id: str) -> ProfileSession:
+    session = ProfileSession(request_id)
+    with _sessions_lock:
+        _sessions[request_id] = session
+    return session
+
+
+def finish_profiling(request_id: str, output_dir: str) -> Optional[str]:
+    """Stop collecting for ``request_id`` and write ``<request_id>.prof`` to ``output_dir``."""
+    with _sessions_lock:
+        session = _sessions.pop(request_id, None)
+    return session.dump(output_dir) if session else None
+
+
+@contextmanager
+def profiled(request_id: Optional[str]):
+    # Cheap path: nothing is being profiled.
+    session = _sessions.get(request_id) if _sessions and request_id else None
+    if session is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12+ allows one active profiler per process, so a node of
+        # another profiled run already holds it; run this one unprofiled.
+        print(f"[PROFILE] {request_id}: node runs unprofiled ({e})")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        session.add(profiler)
+
+
+def profile_node(fn: Callable) -> Callable:
+    """Run a graph node under cProfile when its request asked for profiling."""
+
+    @wraps(fn)
+    def wrapper(state, *args, **kwargs):
+        with profiled(state.get("request_id")):
+            return fn(state, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Optional
+
+
+class Readiness:
+    """Tracks the startup state of each backend component for ``/ready``."""
+
+    def __init__(self, components: list[str]):
+        self.components: dict[str, dict[str, Any]] = {
+            name: {"status": "pending", "seconds": None, "error": None}
+            for name in components
+        }
+
+    async def run(self, name: str, fn: Callable, *args) -> Optional[Any]:
+        component = self.components[name]
+        component["status"] = "starting"
+        start = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(fn, *args)
+        except Exception as e:
+            # /ready is served while components start: fill in the details
+            # before the status that marks the component as settled.
+            component["seconds"] = round(time.perf_counter() - start, 3)
+            component["error"] = str(e)
+            component["status"] = "failed"
+            print(f"Startup of {name} failed: {e}")
+            return None
+
+        component["seconds"] = round(time.perf_counter() - start, 3)
+        component["status"] = "ready"
+        return result
+
+    def is_ready(self, name: str) -> bool:
+        return self.components[name]["status"] == "ready"
+
+    @property
+    def ready(self) -> bool:
+        return all(c["status"] == "ready" for c in self.components.values())
+
+    def snapshot(self) -> dict:
+        return {"ready": self.ready, "components": self.components}
+
+
+def start_database():
+    from .db import init_db
+
+    init_db()
+
+
+def start_screen_stream(interval: float = 1.0, first_frame_timeout: float = 5.0):
+    from .tool.screen_streamer import (
+        attach_frame_buffer,
+        get_current_screen,
+        start_screen_stream,
+        use_static_frame_file,
+    )
+
+    fake_frame = os.environ.get("LUCIO_FAKE_FRAME")
+    if fake_frame:
+        use_static_frame_file(fake_frame)
+        return
+
+    frame_buffer = os.environ.get("LUCIO_FRAME_BUFFER")
+    if frame_buffer:
+        attach_frame_buffer(frame_buffer)
+    else:
+        start_screen_stream(interval=interval)
+
+    deadline = time.monotonic() + first_frame_timeout
+    while get_current_screen() is None:
+        if time.monotonic() > deadline:
+            raise RuntimeError("No screen frame captured yet")
+        time.sleep(0.05)
+
+
+def build_workflow():
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from .agent.configuration import Configuration
+    from .agent.graph import build_graph
+    from .agent.node import AgentNodes
+    from .agent.pdfs import pdf_store
+
+    nodes = AgentNodes(Configuration.from_runnable_config())
+    pdf_store.max_bytes = nodes.config.pdf_cache_mb * 1024 * 1024
+    workflow = build_graph(nodes).compile(checkpointer=MemorySaver())
+    return nodes, workflow
+
+
+def build_resumable_runs(workflow):
+    from .agent.blobs import blob_store
+    from .agent.checkpoints import ResumableRuns
+
+    # A resumed run still refers to its blobs, so they live as long as its checkpoint.
+    return ResumableRuns(workflow.checkpointer, on_drop=blob_store.release)
+
+
+def build_batch_runner(nodes):
+    from .agent.batch import BatchLimits, BatchRunner
+
+    config = nodes.config
+    return BatchRunner(nodes, BatchLimits(
+        fetch=config.batch_fetch_concurrency,
+        llm=config.batch_llm_concurrency,
+        render=config.batch_render_concurrency,
+    ))
+
+
+def shutdown(readiness: Readiness):
+    if readiness.components["screen_stream"]["status"] != "pending":
+        from .tool.screen_streamer import stop_screen_stream
+
+        stop_screen_stream()
+    if readiness.is_ready("database"):
+        from .db import dispose_engine
+
+        dispose_engine()
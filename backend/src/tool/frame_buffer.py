@@ -0,0 +1,193 @@
+"""Latest screen frames shared between processes.
+
+One capture process grabs the screen and publishes raw RGB frames into a
+shared-memory ring buffer; every backend process attaches to it and reads the
+newest frame in place, so N processes no longer mean N capture threads each
+PNG-encoding the screen. Frames are only encoded when a process actually needs
+one, and the encoding is cached per sequence number. Run state is per process,
+so each backend is a single worker behind sticky routing (see the README).
+
+    python -m backend.src.tool.frame_buffer --name lucio_frames --interval 1.0
+    LUCIO_FRAME_BUFFER=lucio_frames uvicorn backend.src.app:app --port 8000
+
+Layout: a header (magic, slot count, slot capacity, latest sequence number)
+followed by ``slots`` slots, each a slot header (sequence, width, height,
+byte count) and the pixel data. Each slot is guarded by a seqlock: the writer
+marks the slot odd while copying and even when done, and a reader accepts
+a frame only if the slot's sequence is the expected even value before
+and after it has used the data.
+"""
+import argparse
+import signal
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+MAGIC = 0x4C55_4346  # "LUCF"
+HEADER = struct.Struct("<IIIxxxxQ")  # magic, slots, slot capacity, latest seq
+SLOT_HEADER = struct.Struct("<QIII")  # slot seq, width, height, nbytes
+DEFAULT_NAME = "lucio_frames"
+DEFAULT_CAPACITY = 3840 * 2160 * 3
+
+
+@dataclass
+class Frame:
+    seq: int
+    width: int
+    height: int
+    data: memoryview
+    _buffer: "FrameBuffer"
+    _slot: int
+
+    def valid(self) -> bool:
+        """True while the writer has not started overwriting this frame."""
+        return self._buffer._slot_seq(self._slot) == 2 * self.seq
+
+    def to_image(self):
+        from PIL import Image
+
+        image = Image.frombuffer("RGB", (self.width, self.height), self.data, "raw", "RGB", 0, 1)
+        image.load()
+        if not self.valid():
+            raise BufferError(f"Frame {self.seq} was overwritten while being read")
+        return image
+
+
+class FrameBuffer:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        magic, self.slots, self.slot_capacity, _ = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory {shm.name} is not a Lucio frame buffer")
+        self._slot_size = SLOT_HEADER.size + self.slot_capacity
+
+    @classmethod
+    def create(cls, name: str = DEFAULT_NAME, slots: int = 3, slot_capacity: int = DEFAULT_CAPACITY) -> "FrameBuffer":
+        size = HEADER.size + slots * (SLOT_HEADER.size + slot_capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, slots, slot_capacity, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str = DEFAULT_NAME) -> "FrameBuffer":
+        shm = shared_memory.SharedMemory(name=name)
+        # Readers must not unlink the segment when they exit; only the creator does.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    def _offset(self, slot: int) -> int:
+        return HEADER.size + slot * self._slot_size
+
+    def _slot_seq(self, slot: int) -> int:
+        return struct.unpack_from("<Q", self.shm.buf, self._offset(slot))[0]
+
+    @property
+    def latest_seq(self) -> int:
+        return HEADER.unpack_from(self.shm.buf, 0)[3]
+
+    def publish(self, width: int, height: int, pixels: bytes) -> int:
+        """Copy one RGB frame into the next slot and make it the latest."""
+        nbytes = len(pixels)
+        if nbytes > self.slot_capacity:
+            raise ValueError(f"Frame of {nbytes} bytes exceeds slot capacity {self.slot_capacity}")
+
+        seq = self.latest_seq + 1
+        slot = seq % self.slots
+        offset = self._offset(slot)
+        buf = self.shm.buf
+
+        SLOT_HEADER.pack_into(buf, offset, 2 * seq - 1, width, height, nbytes)
+        start = offset + SLOT_HEADER.size
+        buf[start:start + nbytes] = pixels
+        struct.pack_into("<Q", buf, offset, 2 * seq)
+        struct.pack_into("<Q", buf, HEADER.size - 8, seq)
+        return seq
+
+    def read_latest(self, retries: int = 3) -> Optional[Frame]:
+        """The newest complete frame as a view into shared memory, or None."""
+        for _ in range(retries):
+            seq = self.latest_seq
+            if seq == 0:
+                return None
+            slot = seq % self.slots
+            offset = self._offset(slot)
+            slot_seq, width, height, nbytes = SLOT_HEADER.unpack_from(self.shm.buf, offset)
+            if slot_seq != 2 * seq:
+                continue
+            start = offset + SLOT_HEADER.size
+            frame = Frame(seq, width, height, self.shm.buf[start:start + nbytes], self, slot)
+            if frame.valid():
+                return frame
+        return None
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedFrameReader:
+    """Serves ``get_current_screen`` in a worker from a shared frame buffer."""
+
+    def __init__(self, buffer: FrameBuffer):
+        self.buffer = buffer
+        self._encoded: tuple[int, Optional[str]] = (0, None)
+
+    def get_latest_frame(self) -> Optional[str]:
+        from .screen_streamer import ScreenStreamer
+
+        seq, encoded = self._encoded
+        if seq and seq == self.buffer.latest_seq:
+            return encoded
+
+        for _ in range(3):
+            frame = self.buffer.read_latest()
+            if frame is None:
+                return encoded
+            try:
+                image = frame.to_image()
+            except BufferError:
+                continue
+            encoded = ScreenStreamer.encode_image(image)
+            self._encoded = (frame.seq, encoded)
+            return encoded
+        return encoded
+
+
+def run_capture(name: str, interval: float, slots: int, fake_frame: Optional[str] = None):
+    from PIL import Image, ImageGrab
+
+    buffer = FrameBuffer.create(name, slots=slots)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Publishing screen frames to shared memory '{name}' every {interval}s")
+    try:
+        if fake_frame:
+            image = Image.open(fake_frame).convert("RGB")
+            buffer.publish(image.width, image.height, image.tobytes())
+        while True:
+            if not fake_frame:
+                image = ImageGrab.grab().convert("RGB")
+                buffer.publish(image.width, image.height, image.tobytes())
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        buffer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", default=DEFAULT_NAME)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--fake-frame", default=None, help="Publish this image once instead of capturing")
+    args = parser.parse_args()
+    run_capture(args.name, args.interval, args.slots, args.fake_frame)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
+import html
+import io
 import os
+import re
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import urlparse
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import (
+    Flowable, Frame, PageTemplate, Paragraph, Preformatted, SimpleDocTemplate, Spacer
+)
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 from reportlab.lib import colors
 
@@ -51,17 +56,49 @@ class PDFGenerator:
             parent=self.styles['Heading2'],
             fontSize=14,
             textColor=colors.HexColor('#1f4788'),
-            spaceAfter=8,
+            spaceAfter=19,
             spaceBefore=12,
-            alignment=TA_LEFT
+            alignment=TA_LEFT,
+            keepWithNext=1
+        ))
+        self.styles.add(ParagraphStyle(
+            name='CustomHeading3',
+            parent=self.styles['Heading3'],
+            fontSize=12,
+            textColor=colors.HexColor('#1f4788'),
+            spaceAfter=10,
+            spaceBefore=10,
+            alignment=TA_LEFT,
+            keepWithNext=1
+        ))
+        self.styles.add(ParagraphStyle(
+            name='CustomListItem',
+            parent=self.styles['CustomBody'],
+            alignment=TA_LEFT,
+            spaceAfter=4,
+            leftIndent=18,
+            bulletIndent=6
+        ))
+        self.styles.add(ParagraphStyle(
+            name='CustomCode',
+            parent=self.styles['Code'],
+            fontSize=9,
+            leading=11,
+            backColor=colors.HexColor('#f4f4f4'),
+            borderPadding=4,
+            spaceBefore=4,
+            spaceAfter=10
         ))
 
     def generate_meaningful_filename(
         self,
         title: str,
         keyword: Optional[str] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        run_id: Optional[str] = None
     ) -> str:
+        """``run_id`` (the request id) makes the name unique to one run, so
+        runs of the same page on the same day don't overwrite each other."""
         parts = []
         
         if keyword:
@@ -77,10 +114,27 @@ class PDFGenerator:
         
         timestamp = datetime.now().strftime("%Y%m%d")
         parts.append(timestamp)
+
+        if run_id:
+            parts.append("".join(c for c in run_id if c.isalnum() or c == '-')[:36])
         
         filename = "_".join(filter(None, parts)) + ".pdf"
         return filename
 
+    def open_stream(
+        self,
+        title: str,
+        url: Optional[str] = None,
+        filename: Optional[str] = None,
+        keyword: Optional[str] = None,
+        skip_preamble: bool = False,
+        in_memory: bool = False,
+        run_id: Optional[str] = None
+    ) -> "PDFStream":
+        if not filename:
+            filename = self.generate_meaningful_filename(title, keyword=keyword, url=url, run_id=run_id)
+        return PDFStream(self, filename, title, url, keyword, skip_preamble, in_memory)
+
     def generate_pdf(
         self,
         title: str,
@@ -88,111 +142,307 @@ class PDFGenerator:
         url: Optional[str] = None,
         filename: Optional[str] = None
     ) -> dict:
-        try:
-            if not filename:
-                filename = self.generate_meaningful_filename(title, url=url)
-            
-            file_path = os.path.join(self.output_dir, filename)
-            
-            doc = SimpleDocTemplate(
-                file_path,
-                pagesize=letter,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=0.75*inch,
-                bottomMargin=0.75*inch
-            )
-            
-            story = []
-            
-            story.append(Paragraph(title, self.styles['CustomTitle']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            if url:
-                story.append(Paragraph(f"<b>Source:</b> {url}", self.styles['CustomMeta']))
-            
-            story.append(Paragraph(
-                f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                self.styles['CustomMeta']
-            ))
-            story.append(Spacer(1, 0.3*inch))
-            
-            lines = content.split('\n')
-            current_paragraph = []
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    if current_paragraph:
-                        para_text = ' '.join(current_paragraph)
-                        story.append(Paragraph(para_text, self.styles['CustomBody']))
-                        story.append(Spacer(1, 0.1*inch))
-                        current_paragraph = []
-                elif line.startswith('##'):
-                    if current_paragraph:
-                        para_text = ' '.join(current_paragraph)
-                        story.append(Paragraph(para_text, self.styles['CustomBody']))
-                        story.append(Spacer(1, 0.1*inch))
-                        current_paragraph = []
-                    heading_text = line.replace('##', '').strip()
-                    story.append(Paragraph(f"<b>{heading_text}</b>", self.styles['CustomHeading2']))
-                    story.append(Spacer(1, 0.15*inch))
-                elif line.startswith('-') or line.startswith('*'):
-                    if current_paragraph:
-                        para_text = ' '.join(current_paragraph)
-                        story.append(Paragraph(para_text, self.styles['CustomBody']))
-                        story.append(Spacer(1, 0.1*inch))
-                        current_paragraph = []
-                    bullet_text = line.lstrip('-*').strip()
-                    story.append(Paragraph(f"• {bullet_text}", self.styles['CustomBody']))
-                    story.append(Spacer(1, 0.05*inch))
-                else:
-                    current_paragraph.append(line)
-            
-            if current_paragraph:
-                para_text = ' '.join(current_paragraph)
-                story.append(Paragraph(para_text, self.styles['CustomBody']))
-                story.append(Spacer(1, 0.1*inch))
-
-            doc.build(story)
-            
-            return {
-                'success': True,
-                'file_path': file_path,
-                'filename': filename,
-                'error': None
-            }
-        
-        except Exception as e:
-            error_msg = f"Error generating PDF: {str(e)}"
-            print(error_msg)
-            return {
-                'success': False,
-                'file_path': None,
-                'filename': filename or 'unknown',
-                'error': error_msg
-            }
+        stream = self.open_stream(title, url=url, filename=filename)
+        stream.write(content)
+        return stream.close()
 
     def generate_pdf_from_web(
         self,
         title: str,
         content: str,
         url: Optional[str] = None,
-        keyword: Optional[str] = None
+        keyword: Optional[str] = None,
+        run_id: Optional[str] = None
     ) -> dict:
-        enhanced_content = content
-        if keyword:
-            enhanced_content = f"<b>Keyword Search:</b> {keyword}\n\n{content}"
+        stream = self.open_stream(title, url=url, keyword=keyword, run_id=run_id)
+        stream.write(content)
+        return stream.close()
 
-        filename = self.generate_meaningful_filename(title, keyword=keyword, url=url)
-        
-        return self.generate_pdf(
-            title=title,
-            content=enhanced_content,
-            url=url,
-            filename=filename
+
+class MarkdownFlowables:
+    """Turns Markdown text, fed in pieces, into flowables one line at a time.
+
+    Handles #/##/### headings, - * + bullets, numbered lists, fenced code
+    blocks and blank-line separated paragraphs, with **bold**, *italic* and
+    `code` inline. Only the current paragraph or code block is buffered, and
+    long ones are emitted in pieces, so memory does not grow with the document.
+    """
+
+    MAX_BUFFERED_LINES = 50
+    HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+    BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+    NUMBERED = re.compile(r"^(\s*)(\d+)[.)]\s+(.*)$")
+    RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+    def __init__(self, styles, emit: Callable[[list[Flowable]], None], skip_preamble: bool = False):
+        self.styles = styles
+        self.emit = emit
+        self.skip_preamble = skip_preamble
+        self._partial = ""
+        self._first_line = True
+        self._paragraph: list[str] = []
+        self._code: Optional[list[str]] = None
+
+    def feed(self, text: str):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+
+    def close(self):
+        if self._partial:
+            self._line(self._partial, last=True)
+            self._partial = ""
+        self._flush_paragraph()
+        self._flush_code()
+        self._code = None
+
+    def _line(self, line: str, last: bool = False):
+        if self._first_line and line.strip():
+            self._first_line = False
+            # Same rule as AgentNodes._document_text: drop a chatty first line.
+            if self.skip_preamble and not last and line.strip().startswith(("Here is", "Here's")):
+                return
+
+        if line.strip().startswith("```"):
+            if self._code is None:
+                self._flush_paragraph()
+                self._code = []
+            else:
+                self._flush_code()
+                self._code = None
+            return
+        if self._code is not None:
+            self._code.append(line)
+            if len(self._code) >= self.MAX_BUFFERED_LINES:
+                self._flush_code()
+            return
+
+        stripped = line.strip()
+        if not stripped or self.RULE.match(line):
+            self._flush_paragraph()
+            return
+
+        heading = self.HEADING.match(stripped)
+        if heading:
+            self._flush_paragraph()
+            style = 'CustomHeading2' if len(heading.group(1)) <= 2 else 'CustomHeading3'
+            self.emit([markup_paragraph(heading.group(2), self.styles[style], bold=True)])
+            return
+
+        bullet = self.BULLET.match(line)
+        numbered = self.NUMBERED.match(line)
+        if bullet or numbered:
+            self._flush_paragraph()
+            indent, marker, text = (
+                (bullet.group(1), "\u2022", bullet.group(2)) if bullet
+                else (numbered.group(1), f"{numbered.group(2)}.", numbered.group(3))
+            )
+            style = self.styles['CustomListItem']
+            level = len(indent.expandtabs(4)) // 2
+            if level:
+                style = ParagraphStyle(
+                    f'CustomListItem{level}',
+                    parent=style,
+                    leftIndent=style.leftIndent + 14 * level,
+                    bulletIndent=style.bulletIndent + 14 * level
+                )
+            self.emit([markup_paragraph(text, style, bulletText=marker)])
+            return
+
+        self._paragraph.append(stripped)
+        if len(self._paragraph) >= self.MAX_BUFFERED_LINES:
+            self._flush_paragraph()
+
+    def _flush_paragraph(self):
+        if self._paragraph:
+            text = ' '.join(self._paragraph)
+            self._paragraph = []
+            self.emit([markup_paragraph(text, self.styles['CustomBody']), Spacer(1, 0.1*inch)])
+
+    def _flush_code(self):
+        if self._code:
+            self.emit([Preformatted('\n'.join(self._code), self.styles['CustomCode'])])
+            self._code = []
+
+
+INLINE_TOKEN = re.compile(r"`[^`]+`|\*\*|__|\*")
+EMPHASIS_TAGS = {"**": "b", "__": "b", "*": "i"}
+
+
+def inline_markup(text: str) -> str:
+    """Escape text for a Paragraph and convert Markdown bold, italic and code spans.
+
+    Emphasis markers are matched on a stack, so the tags always nest: closing
+    a marker drops the openers inside it that were never closed, and any
+    marker left unmatched stays literal text.
+    """
+    out: list[str] = []
+    stack: list[tuple[str, int]] = []  # open marker and its index in ``out``
+    pos = 0
+    for match in INLINE_TOKEN.finditer(text):
+        out.append(html.escape(text[pos:match.start()], quote=False))
+        pos = match.end()
+        token = match.group()
+        if token.startswith("`"):
+            out.append(f'<font face="Courier">{html.escape(token[1:-1], quote=False)}</font>')
+            continue
+
+        before = text[match.start() - 1] if match.start() else " "
+        after = text[match.end()] if match.end() < len(text) else " "
+        word = lambda c: c.isalnum() or c == "_"
+        open_markers = [marker for marker, _ in stack]
+        can_close = token in open_markers and not before.isspace() and not (token == "*" and word(after))
+        can_open = token not in open_markers and not after.isspace() and not (token == "*" and word(before))
+
+        if can_close:
+            while stack[-1][0] != token:
+                stack.pop()
+            _, index = stack.pop()
+            tag = EMPHASIS_TAGS[token]
+            out[index] = f"<{tag}>"
+            out.append(f"</{tag}>")
+        else:
+            if can_open:
+                stack.append((token, len(out)))
+            out.append(token)
+    out.append(html.escape(text[pos:], quote=False))
+    return "".join(out)
+
+
+def markup_paragraph(text: str, style: ParagraphStyle, bold: bool = False, **kwargs) -> Paragraph:
+    """A Paragraph of Markdown ``text``; plain escaped text if reportlab rejects the markup."""
+    markup = inline_markup(text)
+    try:
+        return Paragraph(f"<b>{markup}</b>" if bold else markup, style, **kwargs)
+    except ValueError:
+        escaped = html.escape(text, quote=False)
+        return Paragraph(f"<b>{escaped}</b>" if bold else escaped, style, **kwargs)
+
+
+class PDFStream:
+    """A PDF laid out while its content is still being written.
+
+    ``write`` accepts Markdown in arbitrary pieces (e.g. model tokens); each
+    completed line becomes flowables that are placed on the page right away
+    and then dropped, so ``close`` only has to finish the last page and save.
+    """
+
+    def __init__(
+        self,
+        generator: PDFGenerator,
+        filename: str,
+        title: str,
+        url: Optional[str] = None,
+        keyword: Optional[str] = None,
+        skip_preamble: bool = False,
+        in_memory: bool = False
+    ):
+        self.filename = filename
+        # In memory the PDF is written to ``buffer`` and never touches the disk.
+        self.buffer = io.BytesIO() if in_memory else None
+        self.file_path = None if in_memory else os.path.join(generator.output_dir, filename)
+        self.error: Optional[str] = None
+        self._pending: list[Flowable] = []
+        self._parser = MarkdownFlowables(generator.styles, self._add, skip_preamble=skip_preamble)
+        self.doc = SimpleDocTemplate(
+            self.buffer or self.file_path,
+            pagesize=letter,
+            rightMargin=0.75*inch,
+            leftMargin=0.75*inch,
+            topMargin=0.75*inch,
+            bottomMargin=0.75*inch
         )
 
+        try:
+            self._start_build()
+        except Exception as e:
+            self._fail(e)
+            return
+
+        styles = generator.styles
+        header = [Paragraph(html.escape(title, quote=False), styles['CustomTitle']), Spacer(1, 0.2*inch)]
+        if url:
+            header.append(Paragraph(f"<b>Source:</b> {html.escape(url, quote=False)}", styles['CustomMeta']))
+        header.append(Paragraph(
+            f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            styles['CustomMeta']
+        ))
+        header.append(Spacer(1, 0.3*inch))
+        if keyword:
+            header += [
+                Paragraph(f"<b>Keyword Search:</b> {html.escape(keyword, quote=False)}", styles['CustomBody']),
+                Spacer(1, 0.1*inch),
+            ]
+        self._add(header)
+
+    def _start_build(self):
+        # SimpleDocTemplate.build() split into its start, per-flowable and end
+        # steps, so flowables can be laid out as they are produced.
+        doc = self.doc
+        doc._calc()
+        frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+        doc.addPageTemplates([
+            PageTemplate(id='First', frames=frame, pagesize=doc.pagesize),
+            PageTemplate(id='Later', frames=frame, pagesize=doc.pagesize),
+        ])
+        doc._startBuild()
+        doc.canv._doctemplate = doc
+
+    def write(self, text: str):
+        if self.error is None:
+            try:
+                self._parser.feed(text)
+            except Exception as e:
+                self._fail(e)
+
+    def close(self) -> dict:
+        if self.error is None:
+            try:
+                self._parser.close()
+                self._layout(force=True)
+                del self.doc.canv._doctemplate
+                self.doc._endBuild()
+            except Exception as e:
+                self._fail(e)
+
+        return {
+            'success': self.error is None,
+            'file_path': self.file_path if self.error is None else None,
+            'in_memory': self.buffer is not None,
+            'filename': self.filename,
+            'error': self.error
+        }
+
+    def getvalue(self) -> bytes:
+        """The finished PDF of an in-memory stream."""
+        return self.buffer.getvalue()
+
+    def abort(self):
+        """Stop without saving (e.g. the run was cancelled)."""
+        if self.error is None:
+            self.error = "PDF generation aborted"
+        self._pending = []
+
+    def _add(self, flowables: list[Flowable]):
+        self._pending.extend(flowables)
+        self._layout()
+
+    def _layout(self, force: bool = False):
+        # A heading waits for what follows it so keepWithNext can still move both to the next page.
+        pending = self._pending
+        if not pending or (pending[-1].getKeepWithNext() and not force):
+            return
+        doc = self.doc
+        while pending:
+            doc.clean_hanging()
+            doc.handle_flowable(pending)
+
+    def _fail(self, e: Exception):
+        self.error = f"Error generating PDF: {str(e)}"
+        self._pending = []
+        print(self.error)
+
 
 pdf_generator = PDFGenerator()
 
@@ -201,7 +451,8 @@ def save_to_pdf(
     content: str,
     url: Optional[str] = None,
     keyword: Optional[str] = None,
-    output_dir: str = "./outputs"
+    output_dir: str = "./outputs",
+    run_id: Optional[str] = None
 ) -> dict:
     generator = PDFGenerator(output_dir=output_dir)
     
@@ -209,5 +460,32 @@ def save_to_pdf(
         title=title,
         content=content,
         url=url,
-        keyword=keyword
-    )
\ No newline at end of file
+        keyword=keyword,
+        run_id=run_id
+    )
+
+def open_pdf_stream(
+    title: str,
+    url: Optional[str] = None,
+    keyword: Optional[str] = None,
+    output_dir: str = "./outputs",
+    in_memory: bool = False,
+    run_id: Optional[str] = None
+) -> PDFStream:
+    generator = PDFGenerator(output_dir=output_dir)
+    return generator.open_stream(
+        title, url=url, keyword=keyword, skip_preamble=True, in_memory=in_memory, run_id=run_id
+    )
+
+def render_pdf_bytes(
+    title: str,
+    content: str,
+    url: Optional[str] = None,
+    keyword: Optional[str] = None
+) -> bytes:
+    stream = pdf_generator.open_stream(title, url=url, keyword=keyword, skip_preamble=True, in_memory=True)
+    stream.write(content)
+    result = stream.close()
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return stream.getvalue()
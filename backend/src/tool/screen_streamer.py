@@ -15,8 +15,12 @@ class ScreenStreamer:
 
     def capture_screen(self) -> str:
         screenshot = ImageGrab.grab()
+        return self.encode_image(screenshot)
+
+    @staticmethod
+    def encode_image(image) -> str:
         buffered = io.BytesIO()
-        screenshot.save(buffered, format="png")
+        image.save(buffered, format="png")
         img_base64 = base64.b64encode(buffered.getvalue()).decode()
         return img_base64
 
@@ -51,14 +55,37 @@ class ScreenStreamer:
     def get_latest_frame(self) -> Optional[str]:
         return self.latest_frame
 
+    def use_static_frame(self, frame_b64: str):
+        """Serve a fixed frame instead of capturing the screen (load tests, replays)."""
+        self.stop_streaming()
+        self.latest_frame = frame_b64
+
 screen_streamer = ScreenStreamer(interval=1.0)
+shared_frames = None
 
 def start_screen_stream(interval: float = 1.0):
     screen_streamer.interval = interval
     screen_streamer.start_streaming()
 
+def attach_frame_buffer(name: str):
+    """Read frames published by a separate capture process instead of capturing here."""
+    global shared_frames
+    from .frame_buffer import FrameBuffer, SharedFrameReader
+
+    shared_frames = SharedFrameReader(FrameBuffer.attach(name))
+
 def stop_screen_stream():
+    global shared_frames
     screen_streamer.stop_streaming()
+    if shared_frames:
+        shared_frames.buffer.close()
+        shared_frames = None
+
+def use_static_frame_file(path: str):
+    with open(path, "rb") as f:
+        screen_streamer.use_static_frame(base64.b64encode(f.read()).decode())
 
 def get_current_screen() -> Optional[str]:
+    if shared_frames:
+        return shared_frames.get_latest_frame()
     return screen_streamer.get_latest_frame()
\ No newline at end of file
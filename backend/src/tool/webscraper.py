@@ -3,6 +3,8 @@ from bs4 import BeautifulSoup
 from typing import Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+from ..cancellation import RunCancelled, check_cancelled, on_cancel
+
 class WebScraper:
     def __init__(self, timeout: int = 10):
         self.timeout = timeout
@@ -12,26 +14,39 @@ class WebScraper:
     
     def extract_content(self,url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+            check_cancelled()
+            body = bytearray()
+            with requests.get(url, headers=self.headers, timeout=self.timeout, stream=True) as response, \
+                    on_cancel(response.close):
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    check_cancelled()
+                    body.extend(chunk)
+
+            return self.parse_content(bytes(body))
+        
+        except RunCancelled:
+            raise
+        except Exception as e:
+            # A connection closed by cancellation surfaces as a requests error.
+            check_cancelled()
+            print(f"Error extracting content from {url}: {e}")
+            return None, None, None
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+    def parse_content(self, html: bytes | str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        soup = BeautifulSoup(html, 'html.parser')
 
-            for script in soup(["script","style",]):
-                script.decompose()
+        for script in soup(["script","style",]):
+            script.decompose()
 
-            title = soup.title.string if soup.title else "No title"
+        title = soup.title.string if soup.title else "No title"
 
-            main_content = soup.find(['article', 'main', 'div', 'section'])
-            full_text = main_content.get_text(separator=' ', strip=True) if main_content else soup.get_text(separator=' ', strip=True)
+        main_content = soup.find(['article', 'main', 'div', 'section'])
+        full_text = main_content.get_text(separator=' ', strip=True) if main_content else soup.get_text(separator=' ', strip=True)
 
-            main_content_text = main_content.get_text(separator=' ', strip=True) if main_content else None
-            
-            return title, main_content_text, full_text
+        main_content_text = main_content.get_text(separator=' ', strip=True) if main_content else None
         
-        except Exception as e:
-            print(f"Error extracting content from {url}: {e}")
-            return None, None, None
+        return title, main_content_text, full_text
         
     def search_keyword_in_content(self,content: str, keyword: str) -> str:
 
@@ -79,6 +94,15 @@ def scrape_and_summarize(url:str, keyword: Optional[str] = None) -> dict:
 
     title, _, full_content = web_scraper.extract_content(url)
 
+    return summarize_scraped(url, title, full_content, keyword)
+
+def summarize_scraped(
+    url: str,
+    title: Optional[str],
+    full_content: Optional[str],
+    keyword: Optional[str] = None
+) -> dict:
+
     if not full_content:
         return {
             'title': 'Error',
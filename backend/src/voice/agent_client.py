@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from uuid import uuid4
+
+import requests
+
+
+@dataclass
+class Submission:
+    prompt: str
+    session_id: Optional[str] = None
+    request_id: str = field(default_factory=lambda: str(uuid4()))
+    submitted_at: float = field(default_factory=time.time)
+    superseded: bool = False
+
+
+def print_result(submission: Submission, result: dict):
+    elapsed = time.time() - submission.submitted_at
+    print(f"Agent finished '{submission.prompt}' in {elapsed:.1f}s")
+    print("Agent status:", result.get("status"))
+    print("PDF:", result.get("pdf_file_path") or result.get("pdf_url"))
+    if result.get("errors"):
+        print("Errors:", result.get("errors"))
+
+
+def print_error(submission: Submission, error: Exception):
+    print(f"Failed calling agent for '{submission.prompt}':", error)
+
+
+class AgentClient:
+    """Sends prompts to the agent API from a background thread.
+
+    ``policy="queue"`` runs requests one after another; when more than
+    ``max_pending`` are waiting the oldest waiting one is dropped.
+    ``policy="replace"`` drops everything waiting and supersedes the request
+    in flight: it is cancelled on the backend (``DELETE /run/{request_id}``),
+    which frees the models for the new request.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        prefetch_url: Optional[str] = None,
+        policy: str = "queue",
+        max_pending: int = 2,
+        timeout: float = 600,
+        profile: Optional[str] = None,
+        on_result: Callable[[Submission, dict], None] = print_result,
+        on_error: Callable[[Submission, Exception], None] = print_error,
+    ):
+        if policy not in ("queue", "replace"):
+            raise ValueError(f"Unknown submit policy: {policy}")
+        self.api_url = api_url
+        self.prefetch_url = prefetch_url
+        self.policy = policy
+        self.timeout = timeout
+        self.profile = profile
+        self.on_result = on_result
+        self.on_error = on_error
+
+        self._pending: queue.Queue[Optional[Submission]] = queue.Queue(maxsize=max_pending)
+        self._in_flight: Optional[Submission] = None
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._drain()
+        self._pending.put(None)
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def prefetch(self, session_id: str):
+        """Ask the backend to start perception for ``session_id`` right away."""
+        if not self.prefetch_url:
+            return
+        threading.Thread(target=self._post_prefetch, args=(session_id,), daemon=True).start()
+
+    def _post_prefetch(self, session_id: str):
+        try:
+            r = requests.post(
+                self.prefetch_url, json={"session_id": session_id, "profile": self.profile}, timeout=5
+            )
+            r.raise_for_status()
+        except Exception as e:
+            print("Prefetch request failed:", e)
+
+    def submit(self, prompt: str, session_id: Optional[str] = None) -> Submission:
+        submission = Submission(prompt=prompt, session_id=session_id)
+        with self._lock:
+            if self.policy == "replace":
+                self._drain()
+                if self._in_flight and not self._in_flight.superseded:
+                    self._in_flight.superseded = True
+                    self._cancel(self._in_flight)
+            while True:
+                try:
+                    self._pending.put_nowait(submission)
+                    break
+                except queue.Full:
+                    dropped = self._pending.get_nowait()
+                    if dropped:
+                        print(f"Dropping queued request '{dropped.prompt}'")
+        return submission
+
+    def _cancel(self, submission: Submission):
+        threading.Thread(target=self._delete_run, args=(submission,), daemon=True).start()
+
+    def _delete_run(self, submission: Submission):
+        try:
+            r = requests.delete(
+                f"{self.api_url}/{submission.request_id}",
+                params={"reason": "superseded by a newer request"},
+                timeout=5,
+            )
+            if r.status_code != 404:
+                r.raise_for_status()
+        except Exception as e:
+            print("Cancel request failed:", e)
+
+    def _drain(self):
+        while True:
+            try:
+                self._pending.get_nowait()
+            except queue.Empty:
+                return
+
+    def _post(self, submission: Submission) -> dict:
+        r = self._session.post(
+            self.api_url,
+            json={
+                "prompt": submission.prompt,
+                "request_id": submission.request_id,
+                "session_id": submission.session_id,
+                "profile": self.profile,
+            },
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def _worker_loop(self):
+        while True:
+            submission = self._pending.get()
+            if submission is None:
+                return
+
+            with self._lock:
+                self._in_flight = submission
+            try:
+                result = self._post(submission)
+            except Exception as e:
+                if not submission.superseded:
+                    self.on_error(submission, e)
+                continue
+            finally:
+                with self._lock:
+                    self._in_flight = None
+
+            if submission.superseded:
+                print(f"Request '{submission.prompt}' was superseded ({result.get('status')})")
+                continue
+            self.on_result(submission, result)
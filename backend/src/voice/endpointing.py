@@ -0,0 +1,221 @@
+import wave
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+def rms_int16(pcm: np.ndarray) -> float:
+    if pcm.size == 0:
+        return 0.0
+    x = pcm.astype(np.float32)
+    return float(np.sqrt(np.mean(x * x)))
+
+
+@dataclass
+class EndpointerConfig:
+    sample_rate: int = 16000
+    initial_noise_floor: float = 100.0
+    min_threshold: float = 150.0
+    noise_multiplier: float = 3.0
+    noise_window_sec: float = 3.0
+    noise_percentile: float = 20.0
+    start_frames: int = 3
+    min_hangover_sec: float = 0.4
+    max_hangover_sec: float = 1.2
+    quiet_floor: float = 50.0
+    noisy_floor: float = 400.0
+    leading_silence_sec: float = 3.0
+    max_record_sec: float = 30.0
+    vad_aggressiveness: Optional[int] = None
+
+
+class PreRollBuffer:
+    """Keeps the last ``seconds`` of idle audio so speech that overlaps the
+    wake-word detection latency is not lost."""
+
+    def __init__(self, seconds: float, frame_length: int, sample_rate: int = 16000):
+        maxlen = max(1, int(seconds * sample_rate / frame_length)) if seconds > 0 else 0
+        self._frames: deque[bytes] = deque(maxlen=maxlen)
+
+    def append(self, pcm16: bytes):
+        if self._frames.maxlen:
+            self._frames.append(pcm16)
+
+    def drain(self) -> bytes:
+        audio = b"".join(self._frames)
+        self._frames.clear()
+        return audio
+
+
+class Endpointer:
+    """Hangover-based speech/silence state machine over an adaptive noise floor.
+
+    The noise floor is a low percentile of frame energy over the last
+    ``noise_window_sec`` of idle audio (while waiting for the wake word, and
+    unvoiced frames before speech starts). It is not gated on the threshold it
+    sets, so it follows steady noise of any level. The hangover after speech
+    scales with the floor: short in quiet rooms, up to ``max_hangover_sec``
+    in noisy ones.
+    """
+
+    WAITING = "waiting"
+    SPEECH = "speech"
+    HANGOVER = "hangover"
+    ENDED = "ended"
+
+    def __init__(self, config: Optional[EndpointerConfig] = None):
+        self.config = config or EndpointerConfig()
+        self.noise_floor = self.config.initial_noise_floor
+        self._idle_energies: Optional[deque[float]] = None
+        self._vad = None
+        if self.config.vad_aggressiveness is not None:
+            if webrtcvad is None:
+                print("webrtcvad is not installed, falling back to energy-only endpointing")
+            else:
+                self._vad = webrtcvad.Vad(self.config.vad_aggressiveness)
+        self.reset()
+
+    def reset(self):
+        self.state = self.WAITING
+        self.reason: Optional[str] = None
+        self.elapsed = 0.0
+        self.speech_start: Optional[float] = None
+        self.speech_end: Optional[float] = None
+        self._voiced_run = 0
+        self._silence_run = 0.0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.config.min_threshold, self.noise_floor * self.config.noise_multiplier)
+
+    @property
+    def hangover_sec(self) -> float:
+        cfg = self.config
+        span = max(cfg.noisy_floor - cfg.quiet_floor, 1e-6)
+        noisiness = min(max((self.noise_floor - cfg.quiet_floor) / span, 0.0), 1.0)
+        return cfg.min_hangover_sec + (cfg.max_hangover_sec - cfg.min_hangover_sec) * noisiness
+
+    def calibrate(self, frame: np.ndarray, energy: Optional[float] = None):
+        if energy is None:
+            energy = rms_int16(frame)
+        if self._idle_energies is None:
+            cfg = self.config
+            self._idle_energies = deque(maxlen=max(1, int(cfg.noise_window_sec * cfg.sample_rate / max(frame.size, 1))))
+        self._idle_energies.append(energy)
+        self.noise_floor = float(np.percentile(self._idle_energies, self.config.noise_percentile))
+
+    def is_voiced(self, frame: np.ndarray, energy: float) -> bool:
+        if energy <= self.threshold:
+            return False
+        if self._vad is None:
+            return True
+        # webrtcvad only accepts 10/20/30 ms frames.
+        for ms in (30, 20, 10):
+            n = self.config.sample_rate * ms // 1000
+            if frame.size >= n:
+                return self._vad.is_speech(frame[:n].tobytes(), self.config.sample_rate)
+        return True
+
+    def process(self, frame: np.ndarray) -> bool:
+        """Feed one frame of the recording. Returns True once the utterance has ended."""
+        if self.state == self.ENDED:
+            return True
+
+        cfg = self.config
+        duration = frame.size / cfg.sample_rate
+        self.elapsed += duration
+        energy = rms_int16(frame)
+        voiced = self.is_voiced(frame, energy)
+
+        if self.state == self.WAITING:
+            if voiced:
+                self._voiced_run += 1
+                if self._voiced_run >= cfg.start_frames:
+                    self.state = self.SPEECH
+                    self.speech_start = self.elapsed - self._voiced_run * duration
+            else:
+                self._voiced_run = 0
+                self.calibrate(frame, energy)
+                if self.elapsed >= cfg.leading_silence_sec:
+                    return self._end("no_speech")
+
+        elif self.state == self.SPEECH:
+            if not voiced:
+                self.state = self.HANGOVER
+                self._silence_run = duration
+
+        elif self.state == self.HANGOVER:
+            if voiced:
+                self.state = self.SPEECH
+                self._silence_run = 0.0
+            else:
+                self._silence_run += duration
+                if self._silence_run >= self.hangover_sec:
+                    self.speech_end = self.elapsed - self._silence_run
+                    return self._end("silence")
+
+        if self.elapsed >= cfg.max_record_sec:
+            return self._end("max_duration")
+        return False
+
+    def _end(self, reason: str) -> bool:
+        self.state = self.ENDED
+        self.reason = reason
+        if self.speech_start is not None and self.speech_end is None:
+            self.speech_end = self.elapsed
+        return True
+
+
+@dataclass
+class EndpointResult:
+    speech_start: Optional[float]
+    speech_end: Optional[float]
+    end_time: float
+    reason: Optional[str]
+    noise_floor: float
+
+
+def endpoint_wav(
+    path: str,
+    config: Optional[EndpointerConfig] = None,
+    frame_length: int = 512,
+    calibration_sec: float = 0.0,
+) -> EndpointResult:
+    """Run the endpointer over a 16-bit mono WAV file.
+
+    The first ``calibration_sec`` are treated as idle audio captured while
+    waiting for the wake word, the rest as the recording.
+    """
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono PCM")
+        sample_rate = wf.getframerate()
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+    config = replace(config or EndpointerConfig(), sample_rate=sample_rate)
+    endpointer = Endpointer(config)
+
+    calibration_samples = int(calibration_sec * sample_rate)
+    for i in range(0, calibration_samples - frame_length + 1, frame_length):
+        endpointer.calibrate(pcm[i:i + frame_length])
+
+    for i in range(calibration_samples, pcm.size - frame_length + 1, frame_length):
+        if endpointer.process(pcm[i:i + frame_length]):
+            break
+    else:
+        endpointer._end("eof")
+
+    return EndpointResult(
+        speech_start=endpointer.speech_start,
+        speech_end=endpointer.speech_end,
+        end_time=endpointer.elapsed,
+        reason=endpointer.reason,
+        noise_floor=endpointer.noise_floor,
+    )
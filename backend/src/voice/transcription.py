@@ -0,0 +1,233 @@
+import os
+import threading
+from dataclasses import dataclass, fields
+from typing import Optional
+
+import numpy as np
+from faster_whisper import WhisperModel
+
+
+@dataclass
+class TranscriptionConfig:
+    model_size: str = "small"
+    device: str = "cpu"
+    compute_type: str = "int8"
+    beam_size: int = 5
+    streaming_beam_size: int = 1
+    cpu_threads: int = 0
+    num_workers: int = 1
+    language: Optional[str] = None
+    cache_language: bool = True
+    min_language_probability: float = 0.8
+
+    @classmethod
+    def from_env(cls, prefix: str = "WHISPER_") -> "TranscriptionConfig":
+        """Build a config from ``WHISPER_MODEL_SIZE``, ``WHISPER_BEAM_SIZE``, ... env vars."""
+        values = {}
+        for f in fields(cls):
+            raw = os.environ.get(prefix + f.name.upper())
+            if raw is None:
+                continue
+            if isinstance(f.default, bool):
+                values[f.name] = raw.strip().lower() in ("1", "true", "yes", "on")
+            elif isinstance(f.default, int):
+                values[f.name] = int(raw)
+            elif isinstance(f.default, float):
+                values[f.name] = float(raw)
+            else:
+                values[f.name] = raw or None
+        return cls(**values)
+
+
+class TranscriptionEngine:
+    """A WhisperModel plus the decoding settings used for every utterance.
+
+    With ``language`` unset the language is detected once and, when the
+    detection is confident, reused for later utterances instead of running
+    detection on each one.
+    """
+
+    def __init__(self, config: Optional[TranscriptionConfig] = None):
+        self.config = config or TranscriptionConfig()
+        self.model = WhisperModel(
+            self.config.model_size,
+            device=self.config.device,
+            compute_type=self.config.compute_type,
+            cpu_threads=self.config.cpu_threads,
+            num_workers=self.config.num_workers,
+        )
+        self.detected_language: Optional[str] = None
+
+    @property
+    def language(self) -> Optional[str]:
+        return self.config.language or self.detected_language
+
+    def remember_language(self, info):
+        if self.config.language or not self.config.cache_language or info is None:
+            return
+        if info.language_probability >= self.config.min_language_probability:
+            self.detected_language = info.language
+
+    def transcribe(self, audio: np.ndarray, beam_size: Optional[int] = None, **kwargs):
+        """Transcribe float32 16 kHz audio; returns ``(segments, info)`` like WhisperModel."""
+        segments, info = self.model.transcribe(
+            audio,
+            language=self.language,
+            beam_size=beam_size or self.config.beam_size,
+            **kwargs,
+        )
+        segments = list(segments)
+        self.remember_language(info)
+        return segments, info
+
+    def transcribe_text(self, audio: np.ndarray) -> str:
+        segments, _ = self.transcribe(audio)
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+
+@dataclass
+class Word:
+    text: str
+    start: float
+    end: float
+
+    @property
+    def key(self) -> str:
+        return self.text.strip().lower().strip(".,!?;:\"'")
+
+
+def pcm16_to_float32(pcm16: bytes) -> np.ndarray:
+    return np.frombuffer(pcm16, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class StreamingTranscriber:
+    """Transcribes the recording while it is still growing.
+
+    Every ``step_sec`` of new audio the uncommitted part of the buffer is
+    re-transcribed. Words that two consecutive passes agree on (local
+    agreement) are committed and their audio is dropped from the buffer, so
+    the pass that runs after end-of-speech only covers the short tail.
+    """
+
+    def __init__(
+        self,
+        engine: TranscriptionEngine,
+        sample_rate: int = 16000,
+        step_sec: float = 1.0,
+        min_final_sec: float = 0.3,
+    ):
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self.step_sec = step_sec
+        self.min_final_sec = min_final_sec
+
+        self._lock = threading.Lock()
+        self._new_audio = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._reset()
+
+    def _reset(self):
+        self._audio = bytearray()
+        self._offset_sec = 0.0
+        self._pending_sec = 0.0
+        self._committed: list[Word] = []
+        self._hypothesis: list[Word] = []
+
+    def start(self):
+        with self._lock:
+            self._reset()
+            self._running = True
+        self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._thread.start()
+
+    def feed(self, pcm16: bytes):
+        with self._lock:
+            self._audio.extend(pcm16)
+            self._pending_sec += len(pcm16) / 2 / self.sample_rate
+            if self._pending_sec >= self.step_sec:
+                self._new_audio.notify()
+
+    def finish(self) -> str:
+        with self._lock:
+            self._running = False
+            self._new_audio.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+        audio, offset = self._snapshot()
+        if len(audio) / self.sample_rate >= self.min_final_sec:
+            final = self._transcribe(audio, offset, self.engine.config.beam_size)
+            self._committed.extend(final)
+        elif self._hypothesis:
+            self._committed.extend(self._hypothesis)
+
+        return self.committed_text()
+
+    def committed_text(self) -> str:
+        return " ".join(w.text.strip() for w in self._committed).strip()
+
+    def _snapshot(self) -> tuple[np.ndarray, float]:
+        with self._lock:
+            self._pending_sec = 0.0
+            return pcm16_to_float32(bytes(self._audio)), self._offset_sec
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                while self._running and self._pending_sec < self.step_sec:
+                    self._new_audio.wait()
+                if not self._running:
+                    return
+            audio, offset = self._snapshot()
+            try:
+                self._process_pass(audio, offset)
+            except Exception as e:
+                print(f"Streaming transcription error: {e}")
+
+    def _process_pass(self, audio: np.ndarray, offset: float):
+        words = self._transcribe(audio, offset)
+
+        agreed = 0
+        for new, old in zip(words, self._hypothesis):
+            if new.key != old.key:
+                break
+            agreed += 1
+
+        if agreed:
+            self._committed.extend(words[:agreed])
+            self._trim(words[agreed - 1].end)
+        self._hypothesis = words[agreed:]
+
+    def _trim(self, until_sec: float):
+        with self._lock:
+            drop = int((until_sec - self._offset_sec) * self.sample_rate) * 2
+            if drop <= 0:
+                return
+            del self._audio[:drop]
+            self._offset_sec = until_sec
+
+    def _transcribe(
+        self,
+        audio: np.ndarray,
+        offset: float,
+        beam_size: Optional[int] = None,
+    ) -> list[Word]:
+        if audio.size == 0:
+            return []
+
+        prompt = self.committed_text()[-200:] or None
+        segments, _ = self.engine.transcribe(
+            audio,
+            beam_size=beam_size or self.engine.config.streaming_beam_size,
+            word_timestamps=True,
+            initial_prompt=prompt,
+            condition_on_previous_text=False,
+        )
+
+        words: list[Word] = []
+        for seg in segments:
+            for w in seg.words or []:
+                words.append(Word(text=w.word, start=offset + w.start, end=offset + w.end))
+        return words
@@ -0,0 +1,89 @@
+import wave
+
+import numpy as np
+import pytest
+
+from backend.src.voice.endpointing import EndpointerConfig, PreRollBuffer, endpoint_wav, rms_int16
+
+RATE = 16000
+FRAME = 512
+TOLERANCE = 0.1
+
+
+def noise(seconds: float, rms: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, rms, int(seconds * RATE))
+
+
+def tone(seconds: float, amplitude: float = 4000, hz: float = 220) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return amplitude * np.sin(2 * np.pi * hz * t)
+
+
+def write_wav(path, *parts: np.ndarray) -> str:
+    pcm = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(pcm.tobytes())
+    return str(path)
+
+
+def test_silence_ends_without_speech(tmp_path):
+    path = write_wav(tmp_path / "silence.wav", np.zeros(4 * RATE))
+    result = endpoint_wav(path)
+
+    assert result.reason == "no_speech"
+    assert result.speech_start is None
+    assert result.end_time == pytest.approx(EndpointerConfig().leading_silence_sec, abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("rms", [80, 400, 1500])
+def test_steady_noise_is_not_speech(tmp_path, rms):
+    path = write_wav(tmp_path / "noise.wav", noise(5, rms))
+    result = endpoint_wav(path, calibration_sec=1.0)
+
+    assert result.reason == "no_speech"
+    assert result.speech_start is None
+    assert result.noise_floor == pytest.approx(rms, rel=0.2)
+
+
+@pytest.mark.parametrize("rms", [30, 300])
+def test_tone_burst_ends_on_trailing_silence(tmp_path, rms):
+    # 1 s idle calibration, then 0.5 s quiet, 1 s tone, 2.5 s quiet.
+    path = write_wav(
+        tmp_path / "burst.wav",
+        noise(1.5, rms, seed=1),
+        tone(1.0, amplitude=max(4000, 20 * rms)) + noise(1.0, rms, seed=2),
+        noise(2.5, rms, seed=3),
+    )
+    result = endpoint_wav(path, frame_length=FRAME, calibration_sec=1.0)
+
+    assert result.reason == "silence"
+    assert result.speech_start == pytest.approx(0.5, abs=TOLERANCE)
+    assert result.speech_end == pytest.approx(1.5, abs=TOLERANCE)
+    hangover = result.end_time - result.speech_end
+    assert EndpointerConfig().min_hangover_sec <= hangover <= EndpointerConfig().max_hangover_sec + TOLERANCE
+    if rms > EndpointerConfig().quiet_floor:
+        assert hangover > EndpointerConfig().min_hangover_sec
+
+
+def test_pre_roll_keeps_speech_that_starts_before_the_wake_word():
+    # The tone starts 0.2 s before the wake word fires, inside the 0.3 s pre-roll.
+    idle = np.concatenate([noise(1.0, 50), tone(0.2)]).astype(np.int16)
+    pre_roll = PreRollBuffer(0.3, FRAME, RATE)
+    for i in range(0, idle.size - FRAME + 1, FRAME):
+        pre_roll.append(idle[i:i + FRAME].tobytes())
+
+    kept = np.frombuffer(pre_roll.drain(), dtype=np.int16)
+    frames = int(0.3 * RATE / FRAME)
+    assert kept.size == frames * FRAME
+    assert np.array_equal(kept, idle[(idle.size // FRAME - frames) * FRAME:(idle.size // FRAME) * FRAME])
+    assert rms_int16(kept[-FRAME:]) > 1000
+    assert pre_roll.drain() == b""
+
+
+def test_zero_pre_roll_keeps_nothing():
+    pre_roll = PreRollBuffer(0.0, FRAME, RATE)
+    pre_roll.append(np.ones(FRAME, dtype=np.int16).tobytes())
+    assert pre_roll.drain() == b""
@@ -0,0 +1,48 @@
+import pytest
+
+from backend.src.agent.configuration import Configuration
+from backend.src.agent.node import AgentNodes
+from backend.src.tool.webscraper import summarize_scraped
+
+PAGE = "\n\n".join(
+    f"Paragraph {i} explains one more detail of the article in plain words." for i in range(200)
+)
+
+
+@pytest.fixture(scope="module")
+def nodes():
+    return AgentNodes(Configuration())
+
+
+@pytest.fixture(scope="module")
+def scraped():
+    return summarize_scraped("http://127.0.0.1/article", "Article", PAGE)
+
+
+def page_text(messages) -> str:
+    return str(messages[1].content).split("SCRAPED CONTENT: ", 1)[1]
+
+
+def profile(nodes, name):
+    return nodes.settings({"configurable": {"profile": name}})
+
+
+def test_quality_profile_sends_more_page_text_than_fast(nodes, scraped):
+    fast = page_text(nodes._web_messages("summarize", scraped, profile(nodes, "fast")))
+    quality = page_text(nodes._web_messages("summarize", scraped, profile(nodes, "quality")))
+    assert len(fast) <= 2000
+    assert len(quality) > 2000 + len(fast) // 2
+    assert "[content truncated for PDF]" not in quality
+
+
+def test_web_prompt_falls_back_to_the_scrape_error(nodes):
+    failed = summarize_scraped("http://127.0.0.1/missing", None, None)
+    assert page_text(nodes._web_messages("summarize", failed, nodes.config)) == "Failed to scrape content"
+
+
+def test_fused_prompt_gets_the_same_page_text_as_the_web_prompt(nodes, scraped):
+    cfg = profile(nodes, "quality")
+    fused = str(nodes._fused_messages("summarize", scraped, cfg)[1].content)
+    fused_page = fused.split("PAGE CONTENT:\n", 1)[1].split("\n\nOUTPUT THE DOCUMENT NOW", 1)[0]
+    assert fused_page == page_text(nodes._web_messages("summarize", scraped, cfg))
+    assert len(fused_page) > 2000
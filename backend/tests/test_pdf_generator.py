@@ -0,0 +1,41 @@
+import pytest
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph
+
+from backend.src.tool.pdf_generator import PDFGenerator, inline_markup, markup_paragraph
+
+CROSSED = [
+    "**a *b** c*",
+    "**bold with `code**` here`",
+    "*a **b* c**",
+    "**unclosed *italic",
+    "__a **b__ c**",
+]
+
+
+@pytest.mark.parametrize("text", CROSSED)
+def test_crossed_emphasis_gives_markup_reportlab_accepts(text):
+    Paragraph(inline_markup(text), getSampleStyleSheet()["Normal"])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("plain **bold** and *it*", "plain <b>bold</b> and <i>it</i>"),
+    ("**a *b** c*", "<b>a *b</b> c*"),
+    ("**bold with `code**` here`", '**bold with <font face="Courier">code**</font> here`'),
+    ("2 * 3 * 4", "2 * 3 * 4"),
+    ("`x<y` & z", '<font face="Courier">x&lt;y</font> &amp; z'),
+])
+def test_inline_markup(text, expected):
+    assert inline_markup(text) == expected
+
+
+def test_markup_paragraph_keeps_the_words():
+    paragraph = markup_paragraph("**a *b** c*", getSampleStyleSheet()["Normal"])
+    assert paragraph.getPlainText() == "a *b c*"
+
+
+def test_pdf_with_crossed_emphasis_renders(tmp_path):
+    content = "## Heading with **a *b** c*\n\n" + "\n".join(f"- {text}" for text in CROSSED) + "\n\n" + " ".join(CROSSED)
+    result = PDFGenerator(output_dir=str(tmp_path)).generate_pdf("Crossed", content, filename="crossed.pdf")
+    assert result["success"], result["error"]
+    assert (tmp_path / "crossed.pdf").stat().st_size > 0
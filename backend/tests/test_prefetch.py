@@ -0,0 +1,31 @@
+import time
+
+from backend.src.agent.prefetch import PrefetchRegistry
+
+
+def test_back_to_back_sessions_both_start():
+    registry = PrefetchRegistry()
+    assert registry.start("first", lambda: {"screen_description": "first"})
+    assert registry.start("second", lambda: {"screen_description": "second"})
+    assert registry.get("first", timeout=5) == {"screen_description": "first"}
+    assert registry.get("second", timeout=5) == {"screen_description": "second"}
+
+
+def test_expired_entry_is_purged_on_next_start():
+    registry = PrefetchRegistry(ttl_sec=60)
+    assert registry.start("stale", lambda: {"screen_description": "stale"})
+    registry.get("stale", timeout=5)
+    future, created, token = registry._entries["stale"]
+    registry._entries["stale"] = (future, created - 120, token)
+
+    assert registry.start("fresh", lambda: {"screen_description": "fresh"})
+    assert "stale" not in registry._entries
+    assert token.cancelled
+    assert registry.get("stale") is None
+    assert registry.get("fresh", timeout=5) == {"screen_description": "fresh"}
+
+
+def test_same_session_starts_once():
+    registry = PrefetchRegistry()
+    assert registry.start("session", lambda: time.sleep(0.1) or {})
+    assert not registry.start("session", lambda: {})
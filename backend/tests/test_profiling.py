@@ -0,0 +1,49 @@
+import threading
+
+from backend.src import profiling
+from backend.src.profiling import finish_profiling, profile_node, start_profiling
+
+
+@profile_node
+def node(state):
+    # Hold both nodes inside their profiled() block at the same time.
+    state["inside"].wait(5)
+    return {"status": f"done {state['request_id']}"}
+
+
+def test_concurrent_profiled_runs_both_complete(tmp_path):
+    request_ids = ["run-a", "run-b"]
+    inside = threading.Barrier(len(request_ids))
+    results, errors = {}, []
+
+    def run(request_id):
+        try:
+            results[request_id] = node({"request_id": request_id, "inside": inside})
+        except Exception as e:
+            errors.append(e)
+
+    for request_id in request_ids:
+        start_profiling(request_id)
+    threads = [threading.Thread(target=run, args=(request_id,)) for request_id in request_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    paths = [finish_profiling(request_id, str(tmp_path)) for request_id in request_ids]
+
+    assert errors == []
+    assert results == {request_id: {"status": f"done {request_id}"} for request_id in request_ids}
+    assert any(paths)
+
+
+def test_node_runs_unprofiled_when_another_profiler_is_active(monkeypatch, tmp_path):
+    class ActiveProfiler:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", ActiveProfiler)
+    start_profiling("run-c")
+    result = node({"request_id": "run-c", "inside": threading.Barrier(1)})
+
+    assert result == {"status": "done run-c"}
+    assert finish_profiling("run-c", str(tmp_path)) is None
@@ -0,0 +1,111 @@
+"""Micro-benchmarks for the CPU-bound hot paths.
+
+Runs offline: no Ollama, no network, no database. Each case is timed with
+``timeit`` on fixed synthetic fixtures; results are saved to
+``benchmarks/results/components.json`` and compared with the previous run
+(or ``--baseline NAME``), flagging cases slower by more than ``--threshold``.
+
+    python -m benchmarks.components
+    python -m benchmarks.components --only pdf --repeat 3
+"""
+import argparse
+import statistics
+import tempfile
+import timeit
+from typing import Callable
+
+from .common import load_results, save_results
+from . import synthetic
+
+
+def build_cases(tmp_dir: str) -> dict[str, Callable[[], object]]:
+    from backend.src.agent.configuration import Configuration
+    from backend.src.agent.node import AgentNodes
+    from backend.src.tool.pdf_generator import PDFGenerator
+    from backend.src.tool.screen_streamer import ScreenStreamer
+    from backend.src.tool.webscraper import WebScraper
+    from backend.src.voice.endpointing import rms_int16
+
+    nodes = AgentNodes(Configuration())
+    scraper = WebScraper()
+    pdf = PDFGenerator(output_dir=tmp_dir)
+
+    html = synthetic.article_html(paragraphs=60)
+    text = synthetic.article_text(paragraphs=60)
+    small_doc = synthetic.markdown_document(pages=1)
+    large_doc = synthetic.markdown_document(pages=100)
+    image = synthetic.screen_image()
+    frame = synthetic.audio_frame()
+
+    def extract_urls():
+        for response in synthetic.LLAVA_RESPONSES:
+            nodes._extract_url(response)
+
+    def extract_keywords():
+        for prompt in synthetic.USER_PROMPTS:
+            nodes._extract_keywords("", prompt)
+
+    return {
+        "agent.extract_url": extract_urls,
+        "agent.extract_keywords": extract_keywords,
+        "scraper.parse_content": lambda: scraper.parse_content(html),
+        "scraper.search_keyword": lambda: scraper.search_keyword_in_content(text, "latency"),
+        "pdf.generate_small": lambda: pdf.generate_pdf("Benchmark", small_doc, filename="small.pdf"),
+        "pdf.generate_100_pages": lambda: pdf.generate_pdf("Benchmark", large_doc, filename="large.pdf"),
+        "screen.encode_png": lambda: ScreenStreamer.encode_image(image),
+        "audio.rms_int16": lambda: rms_int16(frame),
+    }
+
+
+def time_case(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    per_call = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "min_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default="", help="Run only cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per repeat")
+    parser.add_argument("--baseline", default="components")
+    parser.add_argument("--save-as", default="components")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline) or {}
+    results = {}
+    regressions = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, fn in build_cases(tmp_dir).items():
+            if args.only and args.only not in name:
+                continue
+            result = time_case(fn, args.repeat, args.min_time)
+            results[name] = result
+
+            line = f"{name:<28} median {result['median_us']:>14.3f} us   min {result['min_us']:>14.3f} us"
+            previous = baseline.get(name)
+            if previous:
+                change = result["median_us"] / previous["median_us"] - 1
+                line += f"   {change:+.1%} vs baseline"
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += "  REGRESSION"
+            print(line)
+
+    print("Saved to", save_results(args.save_as, results))
+    if regressions:
+        raise SystemExit(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
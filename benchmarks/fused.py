@@ -0,0 +1,206 @@
+"""Two-stage (web model, then content model) vs. fused (one content model call).
+
+Scrapes each page once, then writes the document both ways from the same
+scraped data through the real ``AgentNodes`` helpers and Ollama, ``--repeat``
+times per page. Reports latency, tokens and reference-free quality measures
+for each pipeline:
+
+- ``coverage``: share of the page's 30 most frequent content words the document uses
+- ``grounded``: share of the document's content words that occur on the page
+- ``headings``, ``paragraphs``, ``words``: shape of the document
+- ``agreement``: word-overlap F1 between the fused and the two-stage document
+
+With ``--judge`` the planning model also picks the better document of each
+pair, asked once in each order so position bias cancels out.
+
+    python -m benchmarks.fused --url https://en.wikipedia.org/wiki/Ollama --repeat 3 --judge
+    python -m benchmarks.fused --synthetic 3 --fake-ollama
+"""
+import argparse
+import re
+import statistics
+import time
+from collections import Counter
+from uuid import uuid4
+
+from .common import normalize_words, percentile, save_results
+
+PIPELINES = ("two_stage", "fused")
+
+STOPWORDS = {
+    "about", "after", "also", "been", "being", "between", "both", "from", "have", "here", "into",
+    "more", "most", "must", "only", "other", "over", "same", "should", "some", "such", "than",
+    "that", "their", "them", "then", "there", "these", "they", "this", "those", "through", "very",
+    "were", "what", "when", "where", "which", "while", "will", "with", "would", "your",
+}
+
+JUDGE_PROMPT = """Two documents were written from the same web page for the same request.
+
+USER REQUEST: {prompt}
+
+PAGE CONTENT:
+{page}
+
+DOCUMENT A:
+{a}
+
+DOCUMENT B:
+{b}
+
+Which document answers the request better while staying faithful to the page and being well organized?
+Answer with a single letter: A or B."""
+
+
+def content_words(text: str) -> list[str]:
+    return [w for w in normalize_words(text) if len(w) > 3 and w not in STOPWORDS]
+
+
+def quality(document: str, page: str) -> dict:
+    page_words = Counter(content_words(page))
+    doc_words = content_words(document)
+    top = [w for w, _ in page_words.most_common(30)]
+    used = set(doc_words)
+    return {
+        "coverage": round(sum(w in used for w in top) / len(top), 3) if top else 0.0,
+        "grounded": round(sum(w in page_words for w in doc_words) / len(doc_words), 3) if doc_words else 0.0,
+        "headings": sum(1 for line in document.splitlines() if line.lstrip().startswith("#")),
+        "paragraphs": len([p for p in re.split(r"\n\s*\n", document) if p.strip()]),
+        "words": len(normalize_words(document)),
+    }
+
+
+def overlap_f1(a: str, b: str) -> float:
+    wa, wb = Counter(content_words(a)), Counter(content_words(b))
+    common = sum((wa & wb).values())
+    if not common:
+        return 0.0
+    precision, recall = common / sum(wa.values()), common / sum(wb.values())
+    return round(2 * precision * recall / (precision + recall), 3)
+
+
+def write_document(nodes, pipeline: str, prompt: str, scraped: dict) -> dict:
+    from backend.src.metrics import finish_trace, node_scope, start_trace
+
+    request_id = str(uuid4())
+    start_trace(request_id)
+    started = time.perf_counter()
+    if pipeline == "fused":
+        with node_scope("fused", request_id):
+            document = nodes._summarize_fused(prompt, scraped)
+    else:
+        with node_scope("web", request_id):
+            extracted = nodes._process_web(prompt, scraped)
+        with node_scope("content", request_id):
+            document = nodes._format_content(prompt, extracted)
+    latency = time.perf_counter() - started
+    tokens = finish_trace(request_id).breakdown()["tokens"]
+    return {"document": document, "latency_s": latency, "tokens": tokens}
+
+
+def judge(nodes, prompt: str, page: str, fused: str, two_stage: str) -> float:
+    """Fraction of the two blind comparisons the fused document wins."""
+    from langchain_core.messages import HumanMessage
+
+    wins = 0
+    for a, b, fused_letter in ((fused, two_stage, "A"), (two_stage, fused, "B")):
+        question = JUDGE_PROMPT.format(prompt=prompt, page=page[:3000], a=a, b=b)
+        answer = str(nodes._invoke_chat("planning", [HumanMessage(content=question)]).content).strip().upper()
+        wins += answer[:1] == fused_letter
+    return wins / 2
+
+
+def summarize(runs: list[dict]) -> dict:
+    latencies = [r["latency_s"] for r in runs]
+    summary = {
+        "runs": len(runs),
+        "latency_p50_s": round(percentile(latencies, 50), 2),
+        "latency_p95_s": round(percentile(latencies, 95), 2),
+        "prompt_tokens": round(statistics.mean(r["tokens"]["prompt"] for r in runs)),
+        "completion_tokens": round(statistics.mean(r["tokens"]["completion"] for r in runs)),
+    }
+    for key in ("coverage", "grounded", "headings", "paragraphs", "words"):
+        summary[key] = round(statistics.mean(r["quality"][key] for r in runs), 3)
+    return summary
+
+
+def compare(urls: list[str], prompt: str, repeat: int, use_judge: bool, ollama_base_url: str | None) -> dict:
+    from backend.src.agent.configuration import Configuration
+    from backend.src.agent.node import AgentNodes
+
+    settings = {"ollama_base_url": ollama_base_url} if ollama_base_url else {}
+    nodes = AgentNodes(Configuration(**settings))
+    runs = {pipeline: [] for pipeline in PIPELINES}
+    agreement, judged = [], []
+
+    for url in urls:
+        scraped = nodes._scrape(url, nodes._extract_keywords('', prompt))
+        if not scraped.get('full_content'):
+            print(f"Skipping {url}: nothing scraped")
+            continue
+        page = scraped['full_content']
+
+        for i in range(repeat):
+            # Alternate which pipeline goes first so warm caches favour neither.
+            order = PIPELINES if i % 2 == 0 else PIPELINES[::-1]
+            results = {}
+            for pipeline in order:
+                result = write_document(nodes, pipeline, prompt, scraped)
+                result["quality"] = quality(result["document"], page)
+                runs[pipeline].append(result)
+                results[pipeline] = result
+                print(f"{url} #{i + 1} {pipeline:<10} {result['latency_s']:.1f}s {result['quality']}")
+
+            agreement.append(overlap_f1(results["fused"]["document"], results["two_stage"]["document"]))
+            if use_judge:
+                judged.append(judge(
+                    nodes, prompt, page, results["fused"]["document"], results["two_stage"]["document"]
+                ))
+
+    if not runs["fused"]:
+        raise SystemExit("No page could be scraped")
+    comparison = {pipeline: summarize(runs[pipeline]) for pipeline in PIPELINES}
+    comparison["agreement_f1"] = round(statistics.mean(agreement), 3)
+    comparison["speedup"] = round(comparison["two_stage"]["latency_p50_s"] / comparison["fused"]["latency_p50_s"], 2)
+    if judged:
+        comparison["fused_judge_win_rate"] = round(statistics.mean(judged), 3)
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", default=[], help="Page to summarize (repeatable)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also serve and use this many synthetic articles")
+    parser.add_argument("--prompt", default="Summarize this page and create a PDF")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--judge", action="store_true", help="Let the planning model compare each pair")
+    parser.add_argument("--fake-ollama", action="store_true", help="Use the fake Ollama server (latency plumbing only)")
+    parser.add_argument("--save-as", default="fused")
+    args = parser.parse_args()
+
+    urls = list(args.url)
+    if args.synthetic:
+        from .load import static_site
+
+        static_site.serve(8802)
+        urls += [f"http://127.0.0.1:8802/article/{n}" for n in range(1, args.synthetic + 1)]
+    if not urls:
+        parser.error("Give at least one --url or --synthetic N")
+
+    ollama_base_url = None
+    if args.fake_ollama:
+        from .load import fake_ollama
+
+        fake_ollama.serve(11510, fake_ollama.FakeOllamaConfig())
+        ollama_base_url = "http://127.0.0.1:11510"
+
+    comparison = compare(urls, args.prompt, args.repeat, args.judge, ollama_base_url)
+    for pipeline in PIPELINES:
+        print(f"{pipeline:<10} {comparison[pipeline]}")
+    for key in ("agreement_f1", "speedup", "fused_judge_win_rate"):
+        if key in comparison:
+            print(f"{key:<22} {comparison[key]}")
+    print("Saved to", save_results(args.save_as, {"settings": vars(args), "urls": urls, **comparison}))
+
+
+if __name__ == "__main__":
+    main()
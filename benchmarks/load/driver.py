@@ -0,0 +1,134 @@
+"""Fires concurrent /run requests at a running backend and reports latency.
+
+    python -m benchmarks.load.driver --base-url http://127.0.0.1:8000 \
+        --requests 20 --concurrency 4
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+
+from ..common import percentile, save_results
+
+
+def run_one(base_url: str, prompt: str, target_url: Optional[str], timeout: float) -> dict:
+    payload = {"prompt": prompt}
+    if target_url:
+        payload["url"] = target_url
+
+    start = time.perf_counter()
+    try:
+        r = requests.post(f"{base_url}/run", json=payload, timeout=timeout)
+        body = r.json() if r.headers.get("content-type", "").startswith("application/json") else {}
+        status = body.get("status", f"http_{r.status_code}")
+    except requests.RequestException as e:
+        body, status = {}, f"error: {type(e).__name__}"
+
+    return {
+        "latency_sec": time.perf_counter() - start,
+        "status": status,
+        "nodes": body.get("timings", {}).get("nodes", {}),
+        "errors": body.get("errors", []),
+    }
+
+
+def summarize(results: list[dict], wall_sec: float, concurrency: int) -> dict:
+    latencies = [r["latency_sec"] for r in results]
+    completed = [r for r in results if r["status"] == "completed"]
+
+    node_times: dict[str, list[float]] = {}
+    for r in results:
+        for node, ms in r["nodes"].items():
+            node_times.setdefault(node, []).append(ms)
+
+    statuses: dict[str, int] = {}
+    for r in results:
+        statuses[r["status"]] = statuses.get(r["status"], 0) + 1
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "completed": len(completed),
+        "statuses": statuses,
+        "wall_sec": round(wall_sec, 3),
+        "throughput_rps": round(len(completed) / wall_sec, 4) if wall_sec else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(max(latencies)) if latencies else None,
+        },
+        "nodes_ms": {
+            node: {
+                "mean": round(statistics.mean(values), 1),
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+            }
+            for node, values in node_times.items()
+        },
+    }
+
+
+def run_load(
+    base_url: str,
+    total: int,
+    concurrency: int,
+    prompt: str,
+    target_url: Optional[str] = None,
+    timeout: float = 600,
+) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(
+                run_one,
+                base_url,
+                prompt,
+                target_url.format(i=i) if target_url else None,
+                timeout,
+            )
+            for i in range(total)
+        ]
+        results = [f.result() for f in futures]
+    return summarize(results, time.perf_counter() - start, concurrency)
+
+
+def print_summary(summary: dict):
+    lat = summary["latency_ms"]
+    print(
+        f"concurrency={summary['concurrency']:<3} completed={summary['completed']}/{summary['requests']} "
+        f"throughput={summary['throughput_rps']} req/s  "
+        f"p50={lat['p50']}ms p95={lat['p95']}ms p99={lat['p99']}ms"
+    )
+    for node, stats in summary["nodes_ms"].items():
+        print(f"    {node:>12}: mean {stats['mean']}ms  p50 {stats['p50']}ms  p95 {stats['p95']}ms")
+    if set(summary["statuses"]) - {"completed"}:
+        print(f"    statuses: {summary['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", default="1,4")
+    parser.add_argument("--prompt", default="Summarize this page and create a PDF")
+    parser.add_argument("--target-url", default=None, help="Skip perception by sending this URL; '{i}' is replaced by the request index")
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    summaries = []
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        summary = run_load(args.base_url, args.requests, concurrency, args.prompt, args.target_url, args.timeout)
+        print_summary(summary)
+        summaries.append(summary)
+    print("Saved to", save_results("load", {"runs": summaries}))
+
+
+if __name__ == "__main__":
+    main()
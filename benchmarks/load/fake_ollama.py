@@ -0,0 +1,192 @@
+"""A stand-in for the Ollama HTTP API with configurable latency.
+
+Implements ``/api/generate`` and ``/api/chat`` (streaming and non-streaming)
+plus ``/api/tags``. Each call waits ``prompt_latency`` seconds (prompt
+evaluation / model load) and then emits ``completion_tokens`` tokens at
+``tokens_per_sec``. ``/api/generate`` answers like LLaVA and reports
+``page_url`` as the URL it sees on screen.
+
+With ``prompt_tokens_per_sec`` set, prompt evaluation also costs time per
+prompt token, except for the prefix a prompt shares with the previous one sent
+to the same model, which Ollama would still have in its KV cache.
+
+    python -m benchmarks.load.fake_ollama --port 11500 --page-url http://127.0.0.1:8800/article/1
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .. import synthetic
+
+
+@dataclass
+class FakeOllamaConfig:
+    prompt_latency: float = 0.5
+    tokens_per_sec: float = 40.0
+    completion_tokens: int = 120
+    page_url: str = "http://127.0.0.1:8800/article/1"
+    prompt_tokens_per_sec: float = 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    config: FakeOllamaConfig = FakeOllamaConfig()
+    prompt_cache: dict[str, str] = {}
+    cache_lock = threading.Lock()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": []})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/api/generate":
+            images = body.get("images") or []
+            prompt = "".join([
+                f"<system>{body.get('system', '')}<user>",
+                *(hashlib.sha256(image.encode()).hexdigest() for image in images),
+                body.get("prompt", ""),
+            ])
+            prompt_tokens = estimate_tokens(body.get("system", "") + body.get("prompt", "")) + 576 * len(images)
+            text = (
+                "1. Description: A browser window showing an article.\n"
+                f"2. URL: {self.config.page_url}\n"
+                "3. Keywords: article, summary\n"
+                "4. Intent: summarize the page into a PDF"
+            )
+            self._respond(body, prompt, prompt_tokens, text, chat=False)
+        elif self.path == "/api/chat":
+            prompt = "".join(f"<{m.get('role')}>{m.get('content', '')}" for m in body.get("messages", []))
+            text = synthetic.markdown_document(pages=1)
+            content = "".join(str(m.get("content", "")) for m in body.get("messages", []))
+            self._respond(body, prompt, estimate_tokens(content), text, chat=True)
+        else:
+            self.send_error(404)
+
+    def _prompt_eval_seconds(self, model: str, prompt: str) -> float:
+        cfg = self.config
+        if cfg.prompt_tokens_per_sec <= 0:
+            return cfg.prompt_latency
+        with self.cache_lock:
+            previous = self.prompt_cache.get(model, "")
+            self.prompt_cache[model] = prompt
+        cached = len(os.path.commonprefix([previous, prompt]))
+        return cfg.prompt_latency + estimate_tokens(prompt[cached:]) / cfg.prompt_tokens_per_sec
+
+    def _respond(self, body: dict, prompt: str, prompt_tokens: int, text: str, chat: bool):
+        cfg = self.config
+        words = text.split(" ")
+        tokens = [w + " " for w in words][: cfg.completion_tokens] or [""]
+        started = time.perf_counter()
+        prompt_eval = self._prompt_eval_seconds(body.get("model", "fake"), prompt)
+        time.sleep(prompt_eval)
+
+        def chunk(content: str, done: bool) -> dict:
+            data = {
+                "model": body.get("model", "fake"),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "done": done,
+            }
+            if chat:
+                data["message"] = {"role": "assistant", "content": content}
+            else:
+                data["response"] = content
+            if done:
+                total_ns = int((time.perf_counter() - started) * 1e9)
+                data.update({
+                    "done_reason": "stop",
+                    "total_duration": total_ns,
+                    "load_duration": 0,
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": int(prompt_eval * 1e9),
+                    "eval_count": len(tokens),
+                    "eval_duration": total_ns - int(prompt_eval * 1e9),
+                })
+            return data
+
+        delay = 1.0 / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0.0
+        if body.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(delay)
+                self._write_chunk(json.dumps(chunk(token, False)) + "\n")
+            self._write_chunk(json.dumps(chunk("", True)) + "\n")
+            self._write_chunk("")
+        else:
+            time.sleep(delay * len(tokens))
+            final = chunk("".join(tokens), True)
+            self._send_json(final)
+
+    def _write_chunk(self, data: str):
+        raw = data.encode("utf-8")
+        self.wfile.write(f"{len(raw):X}\r\n".encode("ascii") + raw + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, data: dict):
+        raw = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def serve(port: int, config: FakeOllamaConfig) -> ThreadingHTTPServer:
+    handler = type(
+        "ConfiguredFakeOllamaHandler",
+        (FakeOllamaHandler,),
+        {"config": config, "prompt_cache": {}, "cache_lock": threading.Lock()},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--prompt-latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--page-url", default="http://127.0.0.1:8800/article/1")
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        prompt_latency=args.prompt_latency,
+        tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens,
+        page_url=args.page_url,
+        prompt_tokens_per_sec=args.prompt_tokens_per_sec,
+    )
+    serve(args.port, config)
+    print(f"Fake Ollama listening on http://127.0.0.1:{args.port}")
+    while True:
+        time.sleep(3600)
+
+
+if __name__ == "__main__":
+    main()
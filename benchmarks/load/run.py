@@ -0,0 +1,114 @@
+"""End-to-end load test against a fully local stack.
+
+Starts the fake Ollama server and the static site in-process, launches the
+backend under uvicorn with a SQLite database, a fixed fake screen frame and
+``OLLAMA_BASE_URL`` pointing at the fake, waits for ``/ready`` and then runs
+the driver at each concurrency level.
+
+    python -m benchmarks.load.run --requests 20 --concurrency 1,2,4,8 \
+        --prompt-latency 0.5 --tokens-per-sec 40
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from .. import synthetic
+from ..common import save_results
+from . import fake_ollama, static_site
+from .driver import print_summary, run_load
+
+
+def wait_for_ready(base_url: str, timeout: float) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            r = requests.get(f"{base_url}/ready", timeout=1.0)
+            body = r.json()
+            if all(c["status"] in ("ready", "failed") for c in body["components"].values()):
+                return body
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Backend at {base_url} did not become ready within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", default="1,2,4")
+    parser.add_argument("--prompt", default="Summarize this page and create a PDF")
+    parser.add_argument("--skip-perception", action="store_true", help="Send the page URL with each request")
+    parser.add_argument("--prompt-latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--backend-port", type=int, default=8765)
+    parser.add_argument("--ollama-port", type=int, default=11500)
+    parser.add_argument("--site-port", type=int, default=8800)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    page_url = f"http://127.0.0.1:{args.site_port}/article/1"
+    site = static_site.serve(args.site_port)
+    ollama = fake_ollama.serve(args.ollama_port, fake_ollama.FakeOllamaConfig(
+        prompt_latency=args.prompt_latency,
+        tokens_per_sec=args.tokens_per_sec,
+        completion_tokens=args.completion_tokens,
+        page_url=page_url,
+    ))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_path = os.path.join(tmp, "frame.png")
+        synthetic.screen_image().save(frame_path)
+
+        env = dict(os.environ)
+        env.update({
+            "OLLAMA_BASE_URL": f"http://127.0.0.1:{args.ollama_port}",
+            "LUCIO_FAKE_FRAME": frame_path,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'load.db')}",
+            "PDF_OUTPUT_DIR": os.path.join(tmp, "outputs"),
+        })
+        base_url = f"http://127.0.0.1:{args.backend_port}"
+        backend = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "backend.src.app:app",
+                "--port", str(args.backend_port),
+                "--workers", str(args.workers),
+                "--log-level", "warning",
+            ],
+            env=env,
+        )
+        try:
+            readiness = wait_for_ready(base_url, timeout=120)
+            if not readiness["ready"]:
+                raise SystemExit(f"Backend failed to start: {readiness['components']}")
+
+            summaries = []
+            for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                summary = run_load(
+                    base_url,
+                    args.requests,
+                    concurrency,
+                    args.prompt,
+                    target_url=page_url if args.skip_perception else None,
+                )
+                print_summary(summary)
+                summaries.append(summary)
+        finally:
+            backend.terminate()
+            backend.wait(timeout=10)
+            ollama.shutdown()
+            site.shutdown()
+
+    print("Saved to", save_results("load", {
+        "settings": vars(args),
+        "runs": summaries,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""A local site serving deterministic article pages for the scraper.
+
+``/article/<n>`` returns a synthetic article (seeded by ``n``); everything
+else is a 404. Pages are rendered once and cached.
+
+    python -m benchmarks.load.static_site --port 8800
+"""
+import argparse
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .. import synthetic
+
+
+@lru_cache(maxsize=256)
+def render_article(n: int, paragraphs: int) -> bytes:
+    return synthetic.article_html(paragraphs=paragraphs, seed=n)
+
+
+class StaticSiteHandler(BaseHTTPRequestHandler):
+    paragraphs = 60
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "article" or not parts[1].isdigit():
+            self.send_error(404)
+            return
+
+        body = render_article(int(parts[1]), self.paragraphs)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port: int, paragraphs: int = 60) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStaticSiteHandler", (StaticSiteHandler,), {"paragraphs": paragraphs})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    args = parser.parse_args()
+
+    serve(args.port, args.paragraphs)
+    print(f"Static site listening on http://127.0.0.1:{args.port}/article/1")
+    while True:
+        time.sleep(3600)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Per-request memory of the agent graph.
+
+Runs ``--concurrency`` graph invocations at once through the real
+``AgentNodes`` with every external call (screen, Ollama, page fetch) served
+from a synthetic replay trace, compiled with a ``MemorySaver``
+checkpointer as a persistent deployment would be. Reports the
+``tracemalloc`` peak and the memory still held once the runs return (what
+the checkpointer keeps), both per request.
+
+    python -m benchmarks.memory --concurrency 4 --page-paragraphs 400
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import tracemalloc
+from uuid import uuid4
+
+from .common import save_results
+from . import synthetic
+
+
+def write_trace(path: str, runs: int, page_paragraphs: int):
+    from backend.src.tool.screen_streamer import ScreenStreamer
+
+    screen = ScreenStreamer.encode_image(synthetic.screen_image())
+    page = synthetic.article_text(paragraphs=page_paragraphs)
+    document = synthetic.markdown_document(pages=2)
+    llava = synthetic.LLAVA_RESPONSES[0]
+    usage = {"input_tokens": 500, "output_tokens": 200, "total_tokens": 700}
+
+    events = [
+        ("ollama_chat", {"content": "1. Analyze screen\n2. Summarize\n3. Generate PDF", "usage": usage}),
+        ("screen", screen),
+        ("ollama_generate", {"response": llava, "prompt_eval_count": 1100, "eval_count": 60}),
+        ("fetch", ["Synthetic article", page]),
+        ("ollama_chat", {"content": document, "usage": usage}),
+        ("ollama_chat", {"content": document, "usage": usage}),
+        ("pdf", None),
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(runs):
+            for kind, response in events:
+                f.write(json.dumps({"kind": kind, "key": "", "request": {}, "response": response}) + "\n")
+
+
+def measure(concurrency: int, rounds: int, page_paragraphs: int) -> dict:
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from backend.src.agent.blobs import blob_store
+    from backend.src.agent.configuration import Configuration
+    from backend.src.agent.graph import build_graph
+    from backend.src.agent.node import AgentNodes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, "trace.jsonl")
+        write_trace(trace_path, concurrency * rounds, page_paragraphs)
+        nodes = AgentNodes(Configuration(
+            trace_mode="replay",
+            trace_path=trace_path,
+            pdf_output_dir=os.path.join(tmp, "outputs"),
+        ))
+        workflow = build_graph(nodes).compile(checkpointer=MemorySaver())
+
+        def run_one():
+            request_id = str(uuid4())
+            workflow.invoke(
+                {
+                    "request_id": request_id,
+                    "input_prompt": synthetic.USER_PROMPTS[0],
+                    "status": "pending",
+                    "messages": [],
+                    "errors": [],
+                },
+                {"configurable": {"thread_id": request_id}},
+            )
+            blob_store.release(request_id)
+
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(rounds):
+            threads = [threading.Thread(target=run_one) for _ in range(concurrency)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    requests = concurrency * rounds
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "peak_mb": round((peak - baseline) / 1e6, 2),
+        "peak_per_concurrent_request_mb": round((peak - baseline) / 1e6 / concurrency, 2),
+        "retained_per_request_mb": round((retained - baseline) / 1e6 / requests, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--page-paragraphs", type=int, default=400)
+    parser.add_argument("--save-as", default="memory")
+    args = parser.parse_args()
+
+    result = measure(args.concurrency, args.rounds, args.page_paragraphs)
+    for key, value in result.items():
+        print(f"{key:<32} {value}")
+    print("Saved to", save_results(args.save_as, {"settings": vars(args), **result}))
+
+
+if __name__ == "__main__":
+    main()
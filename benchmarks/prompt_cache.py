@@ -0,0 +1,159 @@
+"""Prompt-eval time per node: static system prefix vs. the old inline prompt.
+
+Each node's messages are built by the real ``AgentNodes`` helpers and sent
+straight to Ollama (non-streaming, short ``--num-predict``) for ``--repeat``
+different requests in a row, in two layouts:
+
+- ``split``: the static instructions as a system message ahead of the request
+  data, as the nodes send them now
+- ``inline``: one user message with the model prompt, then the request data,
+  then the task instructions, as the nodes used to send them
+
+Ollama keeps the evaluated prompt of the previous call to a model in its KV
+cache and only evaluates what comes after the shared prefix, so from the
+second request on, ``split`` should skip all of the static text. The first
+request of each series is reported separately as ``cold``.
+
+    python -m benchmarks.prompt_cache --repeat 5
+    python -m benchmarks.prompt_cache --fake-ollama
+"""
+import argparse
+import statistics
+
+from .common import save_results
+from . import synthetic
+
+NODES = ("planning", "perception", "web", "content", "fused")
+LAYOUTS = ("inline", "split")
+MODEL_ROLES = {"planning": "planning", "perception": "perception", "web": "web", "content": "content", "fused": "content"}
+
+
+def build_requests(nodes, cfg, node: str, count: int) -> list[dict]:
+    """``count`` different requests for ``node``, each as ``{"system", "user", "inline", ...}``."""
+    from backend.src.agent import prompt as prompts
+    from backend.src.tool.screen_streamer import ScreenStreamer
+    from backend.src.tool.webscraper import summarize_scraped
+
+    role_prompts = {
+        "planning": (prompts.PLANNING_MODEL_PROMPT, prompts.PLANNING_TASK),
+        "perception": (prompts.PERCEPTION_MODEL_PROMPT, prompts.PERCEPTION_TASK),
+        "web": (prompts.WEB_MODEL_PROMPT, prompts.WEB_TASK),
+        "content": (prompts.CONTENT_MODEL_PROMPT, prompts.CONTENT_TASK),
+        "fused": (prompts.FUSED_MODEL_PROMPT, prompts.FUSED_TASK),
+    }
+    role_prompt, task = role_prompts[node]
+    task = task.format(length_rule=nodes._length_rule(cfg))
+
+    requests = []
+    for i in range(count):
+        user_prompt = synthetic.USER_PROMPTS[i % len(synthetic.USER_PROMPTS)]
+        page = synthetic.article_text(paragraphs=12, seed=i + 1)
+        scraped = summarize_scraped(f"http://127.0.0.1/article/{i + 1}", f"Article {i + 1}", page)
+        request = {}
+        if node == "planning":
+            messages = nodes._planning_messages(user_prompt)
+        elif node == "perception":
+            messages = None
+            request = {
+                "system": f"{role_prompt}{task}",
+                "user": f"USER QUERY: {user_prompt}",
+                "image": ScreenStreamer.encode_image(synthetic.screen_image(seed=i + 1)),
+            }
+        elif node == "web":
+            messages = nodes._web_messages(user_prompt, scraped, cfg)
+        elif node == "content":
+            messages = nodes._content_messages(user_prompt, page, cfg)
+        else:
+            messages = nodes._fused_messages(user_prompt, scraped, cfg)
+
+        if messages is not None:
+            request = {"system": str(messages[0].content), "user": str(messages[1].content)}
+        request["inline"] = f"{role_prompt}\n{request['user']}\n{task}"
+        requests.append(request)
+    return requests
+
+
+def send(base_url: str, model: str, request: dict, layout: str, options: dict) -> dict:
+    import httpx
+
+    if "image" in request:
+        body = {"model": model, "images": [request["image"]], "stream": False, "options": options}
+        if layout == "split":
+            body.update(system=request["system"], prompt=request["user"])
+        else:
+            body["prompt"] = request["inline"]
+        path = "/api/generate"
+    else:
+        if layout == "split":
+            messages = [
+                {"role": "system", "content": request["system"]},
+                {"role": "user", "content": request["user"]},
+            ]
+        else:
+            messages = [{"role": "user", "content": request["inline"]}]
+        body = {"model": model, "messages": messages, "stream": False, "options": options}
+        path = "/api/chat"
+
+    data = httpx.post(f"{base_url}{path}", json=body, timeout=600).json()
+    return {
+        "prompt_eval_ms": data.get("prompt_eval_duration", 0) / 1e6,
+        "prompt_tokens": data.get("prompt_eval_count", 0),
+    }
+
+
+def measure(nodes, cfg, node: str, repeat: int, num_predict: int) -> dict:
+    model = getattr(cfg, f"{MODEL_ROLES[node]}_model")
+    options = {**nodes._ollama_options(cfg), "num_predict": num_predict}
+    requests = build_requests(nodes, cfg, node, repeat + 1)
+
+    result = {"model": model}
+    for layout in LAYOUTS:
+        calls = [send(cfg.ollama_base_url, model, request, layout, options) for request in requests]
+        warm = calls[1:]
+        result[layout] = {
+            "cold_ms": round(calls[0]["prompt_eval_ms"], 1),
+            "warm_ms": round(statistics.median(c["prompt_eval_ms"] for c in warm), 1),
+            "prompt_tokens": round(statistics.median(c["prompt_tokens"] for c in warm)),
+        }
+        print(f"{node:<10} {layout:<6} {result[layout]}")
+
+    saved = result["inline"]["warm_ms"] - result["split"]["warm_ms"]
+    result["saved_ms"] = round(saved, 1)
+    result["saved_pct"] = round(100 * saved / result["inline"]["warm_ms"], 1) if result["inline"]["warm_ms"] else 0.0
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--node", action="append", choices=NODES, help="Node to measure (repeatable, default all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm requests per node and layout")
+    parser.add_argument("--profile", help="Measure with this profile's num_ctx and summary settings")
+    parser.add_argument("--num-predict", type=int, default=16, help="Tokens generated per call")
+    parser.add_argument("--fake-ollama", action="store_true", help="Use the fake Ollama server with a simulated prompt cache")
+    parser.add_argument("--save-as", default="prompt_cache")
+    args = parser.parse_args()
+
+    from backend.src.agent.configuration import Configuration
+    from backend.src.agent.node import AgentNodes
+
+    settings = {}
+    if args.fake_ollama:
+        from .load import fake_ollama
+
+        fake_ollama.serve(11511, fake_ollama.FakeOllamaConfig(prompt_latency=0.02, prompt_tokens_per_sec=2000))
+        settings["ollama_base_url"] = "http://127.0.0.1:11511"
+    cfg = Configuration(**settings)
+    if args.profile:
+        cfg = cfg.with_profile(args.profile)
+    nodes = AgentNodes(cfg)
+
+    results = {node: measure(nodes, cfg, node, args.repeat, args.num_predict) for node in args.node or NODES}
+    print()
+    print(f"{'node':<10} {'inline ms':>10} {'split ms':>10} {'saved ms':>10} {'saved %':>8}")
+    for node, r in results.items():
+        print(f"{node:<10} {r['inline']['warm_ms']:>10} {r['split']['warm_ms']:>10} {r['saved_ms']:>10} {r['saved_pct']:>8}")
+    print("Saved to", save_results(args.save_as, {"settings": vars(args), "nodes": results}))
+
+
+if __name__ == "__main__":
+    main()
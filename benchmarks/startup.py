@@ -0,0 +1,122 @@
+"""Backend cold-start profile.
+
+Reports the import-time profile of ``backend.src.app`` (``python -X importtime``)
+and the time from spawning uvicorn until ``/ready`` settles, with the
+per-component startup times the backend reports. Compares against the
+previous saved run.
+
+    python -m benchmarks.startup --port 8765 --top 15
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+import requests
+
+from .common import load_results, save_results
+
+
+def import_profile(module: str, top: int) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [p.strip() for p in line.replace("import time:", "").split("|")]
+        entries.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+
+    target = next((e for e in entries if e["module"] == module), None)
+    entries.sort(key=lambda e: e["cumulative_us"], reverse=True)
+    return {
+        "process_wall_sec": round(wall, 3),
+        "import_sec": round(target["cumulative_us"] / 1e6, 3) if target else None,
+        "top": entries[:top],
+    }
+
+
+def time_to_ready(port: int, timeout: float) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.src.app:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        first_response = None
+        while time.perf_counter() - start < timeout:
+            try:
+                r = requests.get(f"http://127.0.0.1:{port}/ready", timeout=1.0)
+            except requests.RequestException:
+                time.sleep(0.02)
+                continue
+            if first_response is None:
+                first_response = time.perf_counter() - start
+            if r.status_code == 404:
+                # A backend without /ready did all its startup work at import,
+                # so it is ready once it serves anything.
+                return {
+                    "first_response_sec": round(first_response, 3),
+                    "settled_sec": round(first_response, 3),
+                    "ready": True,
+                    "components": {},
+                }
+            body = r.json()
+            if all(c["status"] in ("ready", "failed") for c in body["components"].values()):
+                return {
+                    "first_response_sec": round(first_response, 3),
+                    "settled_sec": round(time.perf_counter() - start, 3),
+                    "ready": body["ready"],
+                    "components": body["components"],
+                }
+            time.sleep(0.02)
+        raise TimeoutError(f"/ready did not settle within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.src.app")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--skip-server", action="store_true")
+    args = parser.parse_args()
+
+    previous = load_results("startup")
+    results = {"imports": import_profile(args.module, args.top)}
+
+    print(f"import {args.module}: {results['imports']['import_sec']}s "
+          f"(process {results['imports']['process_wall_sec']}s)")
+    for entry in results["imports"]["top"]:
+        print(f"  {entry['cumulative_us'] / 1000:9.1f} ms  {entry['module']}")
+
+    if not args.skip_server:
+        results["server"] = time_to_ready(args.port, args.timeout)
+        server = results["server"]
+        print(f"first /ready response after {server['first_response_sec']}s, "
+              f"settled after {server['settled_sec']}s (ready={server['ready']})")
+        for name, component in server["components"].items():
+            print(f"  {name:>14}: {component['status']} in {component['seconds']}s")
+
+    if previous:
+        before = previous["imports"]["import_sec"]
+        print(f"import time vs previous run: {before}s -> {results['imports']['import_sec']}s")
+        if "server" in previous and "server" in results:
+            print(f"settled time vs previous run: {previous['server']['settled_sec']}s "
+                  f"-> {results['server']['settled_sec']}s")
+
+    print("Saved to", save_results("startup", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Deterministic fixtures for the offline benchmarks."""
+import random
+
+WORDS = (
+    "agent model screen browser page summary document voice request content "
+    "latency network render parse token context memory python server client "
+    "stream buffer frame image vision language search keyword result report"
+).split()
+
+LLAVA_RESPONSES = [
+    "1. Description: A browser showing a news article.\n"
+    "2. URL: https://www.example-news.com/world/2024/article-about-things\n"
+    "3. Keywords: news, world\n4. Intent: summarize the article",
+    "1. Description: A documentation page.\n2. URL: docs.python.org\n"
+    "3. Keywords: python, docs\n4. Intent: create a PDF",
+    "The screenshot shows a code hosting site. The address bar contains "
+    "github.com/denos-pb/lucio and the page lists repository files.",
+    "1. Description: A blank new tab page.\n2. URL: N/A\n3. Keywords: none\n4. Intent: unknown",
+]
+
+USER_PROMPTS = [
+    "Summarize this page and create a PDF",
+    "Make me a short report about the pricing section on this website",
+    "Can you explain what this article says about climate policy and energy prices",
+]
+
+
+def sentence(rng: random.Random, length: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(sentences))
+
+
+def article_text(paragraphs: int = 40, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return "\n\n".join(paragraph(rng) for _ in range(paragraphs))
+
+
+def article_html(paragraphs: int = 40, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    body = []
+    for i in range(paragraphs):
+        if i % 8 == 0:
+            body.append(f"<h2>{sentence(rng, 5)}</h2>")
+        body.append(f"<p>{paragraph(rng)}</p>")
+    nav = "".join(f"<li><a href='/p{i}'>{rng.choice(WORDS)}</a></li>" for i in range(30))
+    html = (
+        "<html><head><title>Synthetic article</title>"
+        "<style>body { font-family: sans-serif; }</style>"
+        "<script>var tracking = {};</script></head><body>"
+        f"<nav><ul>{nav}</ul></nav>"
+        f"<article>{''.join(body)}</article>"
+        "<footer>Footer text</footer></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def markdown_document(pages: int = 1, seed: int = 1) -> str:
+    """Roughly ``pages`` letter pages of the markdown the content model produces."""
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(pages):
+        blocks.append(f"## {sentence(rng, 4)}")
+        blocks.append(paragraph(rng, 6))
+        blocks.append("\n".join(f"- {sentence(rng, 9)}" for _ in range(4)))
+        blocks.append(paragraph(rng, 6))
+    return "\n\n".join(blocks)
+
+
+def screen_image(width: int = 1920, height: int = 1080, seed: int = 1):
+    """A screenshot-like image: flat UI regions plus a block of noisy 'text'."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 245, dtype=np.uint8)
+    pixels[: height // 12] = (60, 64, 72)
+    text_block = rng.integers(0, 2, size=(height // 2, width // 2), dtype=np.uint8) * 200
+    pixels[height // 6: height // 6 + height // 2, width // 8: width // 8 + width // 2] = text_block[..., None]
+    return Image.fromarray(pixels, "RGB")
+
+
+def audio_frame(frame_length: int = 512, seed: int = 1):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(frame_length) * 1000).astype(np.int16)
@@ -0,0 +1,191 @@
+"""Offline transcription benchmark.
+
+Runs every combination of the given engine settings over a directory of
+16 kHz mono WAV fixtures. Each ``name.wav`` may have a ``name.txt`` next to
+it holding the reference transcript, which is used for word error rate.
+
+``--mode streaming`` (the default, as the listener uses it) replays each
+fixture in ``--chunk-ms`` chunks at real-time pace through
+``StreamingTranscriber``, which runs ``streaming_beam_size`` passes while the
+audio arrives and a ``beam_size`` pass over the tail afterwards. It reports
+the latency from the last chunk to the final text. ``--mode batch`` times
+whole-utterance ``transcribe_text`` and reports the real-time factor.
+
+    python -m benchmarks.transcription --fixtures path/to/wavs \
+        --models base,small --compute-types int8 --beam-sizes 1,5 \
+        --streaming-beam-sizes 1 --threads 0,4 --languages auto,en
+"""
+import argparse
+import glob
+import itertools
+import os
+import time
+import wave
+
+import numpy as np
+
+from backend.src.voice.transcription import (
+    StreamingTranscriber,
+    TranscriptionConfig,
+    TranscriptionEngine,
+    pcm16_to_float32,
+)
+
+from .common import percentile, save_results, word_error_rate
+
+
+def load_fixtures(directory: str) -> list[dict]:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        with wave.open(path, "rb") as wf:
+            if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                print(f"Skipping {path}: expected 16 kHz mono 16-bit PCM")
+                continue
+            pcm16 = wf.readframes(wf.getnframes())
+            audio = pcm16_to_float32(pcm16)
+
+        reference = None
+        txt_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding="utf-8") as f:
+                reference = f.read().strip()
+
+        fixtures.append({
+            "name": os.path.basename(path),
+            "pcm16": pcm16,
+            "audio": audio,
+            "duration": audio.size / 16000,
+            "reference": reference,
+        })
+    return fixtures
+
+
+def stream_fixture(streamer: StreamingTranscriber, fixture: dict, chunk_ms: int) -> tuple[str, float]:
+    """Replay ``fixture`` at real-time pace; returns the text and the seconds
+    ``finish`` took after the last chunk."""
+    chunk_bytes = 16000 * chunk_ms // 1000 * 2
+    pcm16 = fixture["pcm16"]
+    streamer.start()
+    started = time.perf_counter()
+    for i, offset in enumerate(range(0, len(pcm16), chunk_bytes)):
+        delay = started + i * chunk_ms / 1000 - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        streamer.feed(pcm16[offset:offset + chunk_bytes])
+    t0 = time.perf_counter()
+    text = streamer.finish()
+    return text, time.perf_counter() - t0
+
+
+def run_config(config: TranscriptionConfig, fixtures: list[dict], repeat: int, mode: str, chunk_ms: int) -> dict:
+    start = time.perf_counter()
+    engine = TranscriptionEngine(config)
+    load_sec = time.perf_counter() - start
+
+    engine.transcribe_text(np.zeros(16000, dtype=np.float32))
+    streamer = StreamingTranscriber(engine) if mode == "streaming" else None
+
+    audio_sec = 0.0
+    compute_sec = 0.0
+    final_latencies = []
+    wers = []
+    for fixture in fixtures:
+        elapsed = []
+        for _ in range(repeat):
+            if streamer:
+                text, final_sec = stream_fixture(streamer, fixture, chunk_ms)
+                final_latencies.append(final_sec)
+                continue
+            t0 = time.perf_counter()
+            text = engine.transcribe_text(fixture["audio"])
+            elapsed.append(time.perf_counter() - t0)
+
+        audio_sec += fixture["duration"]
+        if elapsed:
+            compute_sec += min(elapsed)
+        if fixture["reference"] is not None:
+            wers.append(word_error_rate(fixture["reference"], text))
+
+    row = {
+        "mode": mode,
+        "model_size": config.model_size,
+        "compute_type": config.compute_type,
+        "beam_size": config.beam_size,
+        "streaming_beam_size": config.streaming_beam_size,
+        "cpu_threads": config.cpu_threads,
+        "language": config.language or "auto",
+        "load_sec": round(load_sec, 3),
+        "wer": round(sum(wers) / len(wers), 4) if wers else None,
+    }
+    if streamer:
+        row["final_p50_s"] = round(percentile(final_latencies, 50), 3)
+        row["final_p95_s"] = round(percentile(final_latencies, 95), 3)
+    else:
+        row["rtf"] = round(compute_sec / audio_sec, 4) if audio_sec else None
+    return row
+
+
+def split(value: str) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="Directory of 16 kHz mono WAV files (with optional .txt transcripts)")
+    parser.add_argument("--mode", choices=("streaming", "batch"), default="streaming")
+    parser.add_argument("--chunk-ms", type=int, default=32, help="Chunk size fed to the streaming transcriber")
+    parser.add_argument("--models", default="small")
+    parser.add_argument("--compute-types", default="int8")
+    parser.add_argument("--beam-sizes", default="1,5")
+    parser.add_argument("--streaming-beam-sizes", default="1", help="Beam sizes of the passes during the recording (streaming mode)")
+    parser.add_argument("--threads", default="0")
+    parser.add_argument("--languages", default="auto")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--max-wer", type=float, default=None, help="Only consider settings at or below this WER when picking the fastest")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        raise SystemExit(f"No WAV fixtures found in {args.fixtures}")
+    print(f"{len(fixtures)} fixtures, {sum(f['duration'] for f in fixtures):.1f}s of audio")
+
+    rows = []
+    streaming_beams = split(args.streaming_beam_sizes) if args.mode == "streaming" else ["1"]
+    for model, compute_type, beam, streaming_beam, threads, language in itertools.product(
+        split(args.models),
+        split(args.compute_types),
+        split(args.beam_sizes),
+        streaming_beams,
+        split(args.threads),
+        split(args.languages),
+    ):
+        config = TranscriptionConfig(
+            model_size=model,
+            device=args.device,
+            compute_type=compute_type,
+            beam_size=int(beam),
+            streaming_beam_size=int(streaming_beam),
+            cpu_threads=int(threads),
+            language=None if language == "auto" else language,
+            cache_language=False,
+        )
+        row = run_config(config, fixtures, args.repeat, args.mode, args.chunk_ms)
+        rows.append(row)
+        speed = f"final={row['final_p50_s']}s" if args.mode == "streaming" else f"RTF={row['rtf']}"
+        print(
+            f"{row['model_size']:>8} {row['compute_type']:>12} beam={row['beam_size']} "
+            f"stream_beam={row['streaming_beam_size']} threads={row['cpu_threads']} lang={row['language']:>4}  "
+            f"{speed}  WER={row['wer']}  load={row['load_sec']}s"
+        )
+
+    acceptable = [r for r in rows if args.max_wer is None or (r["wer"] is not None and r["wer"] <= args.max_wer)]
+    if acceptable:
+        best = min(acceptable, key=lambda r: r["final_p50_s"] if args.mode == "streaming" else r["rtf"])
+        print("Fastest acceptable setting:", best)
+
+    print("Saved to", save_results(f"transcription_{args.mode}", {"runs": rows}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import threading
 import time
 
+import requests
 import uvicorn
 
-from backend.src.listener import main as listener_main
+READY_URL = "http://127.0.0.1:8000/ready"
 
 
 def start_backend() -> None:
@@ -18,22 +19,44 @@ def start_backend() -> None:
     server.run()
 
 
-def start_listener() -> None:
-    listener_main()
+def wait_until_ready(timeout: float = 60.0, poll_interval: float = 0.1) -> dict | None:
+    deadline = time.monotonic() + timeout
+    last = None
+    while time.monotonic() < deadline:
+        try:
+            r = requests.get(READY_URL, timeout=1.0)
+            last = r.json()
+            settled = all(
+                c.get("status") in ("ready", "failed")
+                for c in last.get("components", {}).values()
+            )
+            if settled:
+                return last
+        except requests.RequestException:
+            pass
+        time.sleep(poll_interval)
+    return last
 
 
 def main() -> None:
+    started = time.perf_counter()
     backend_thread = threading.Thread(target=start_backend, daemon=True)
     backend_thread.start()
 
-    time.sleep(1.0)
+    # Importing the listener pulls in Porcupine, PyAudio and faster-whisper,
+    # so do it while the backend is starting up.
+    from backend.src.listener import main as listener_main
 
-    print("Lucio backend started on http://127.0.0.1:8000")
+    status = wait_until_ready()
+    elapsed = time.perf_counter() - started
+    if status and status.get("ready"):
+        print(f"Lucio backend ready on http://127.0.0.1:8000 after {elapsed:.2f}s")
+    else:
+        print(f"Lucio backend not fully ready after {elapsed:.2f}s: {status}")
     print("Starting voice listener...")
 
-    start_listener()
+    listener_main()
 
 
 if __name__ == "__main__":
     main()
-